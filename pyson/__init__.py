@@ -0,0 +1 @@
+from .src import ENGINES, Engine, get_engine, loads, register
@@ -0,0 +1 @@
+from .engines import ENGINES, Engine, get_engine, loads, register
@@ -0,0 +1,29 @@
+import argparse
+import sys
+
+from . import bench, engines, validate
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="pyson")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    engines.add_arguments(commands.add_parser("parse"))
+    validate.add_arguments(commands.add_parser("validate"))
+    bench.add_arguments(commands.add_parser("bench"))
+
+    args = parser.parse_args(argv)
+    match args.command:
+        case "parse":
+            return engines.main(args)
+        case "validate":
+            return validate.main(args)
+        case "bench":
+            return bench.main(args)
+        case _:
+            parser.error(f"Unknown command {args.command}")
+            return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
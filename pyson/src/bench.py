@@ -0,0 +1,410 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
+from statistics import mean, median
+from time import perf_counter_ns
+from typing import Any, Callable
+
+from . import (
+    direct,
+    encoder,
+    engines,
+    incremental,
+    iterative,
+    mapped,
+    pyson,
+    pyson2,
+    pyson3,
+    relex,
+    stream,
+)
+
+
+@dataclass(frozen=True)
+class Variant:
+    name: str
+    func: Callable[[Any], Any]
+    lex: Callable[[str], Any] | None = None
+    prepare: Callable[[str], Any] | None = None
+
+
+@dataclass(frozen=True)
+class Corpus:
+    shape: str
+    docs: list[str]
+
+    @property
+    def size(self) -> int:
+        return sum(len(doc.encode("utf8")) for doc in self.docs)
+
+
+VARIANTS: dict[str, Variant] = {
+    "pyson": Variant("pyson", pyson.loads, pyson.lex),
+    "pyson2": Variant("pyson2", pyson2.loads, pyson2.lex),
+    "pyson3": Variant("pyson3", pyson3.loads, pyson3.lex),
+    "direct": Variant("direct", direct.loads),
+    "regex": Variant("regex", partial(pyson3.loads, engine="regex"), relex.lex),
+    "stream": Variant("stream", stream.loads, stream.lex),
+    "iterative": Variant("iterative", iterative.loads, iterative.lex),
+    "incremental": Variant("incremental", incremental.loads),
+    "mapped": Variant("mapped", lambda json: mapped.loads(json.encode("utf8"))),
+    "dumps": Variant("dumps", encoder.dumps, prepare=json.loads),
+}
+
+WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod".split()
+ESCAPES = ['"', "\\", "\n", "\t", "\r", "/"]
+
+
+def _word(rng: random.Random) -> str:
+    return rng.choice(WORDS)
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(_word(rng) for _ in range(words))
+
+
+def _record(rng: random.Random, i: int) -> dict[str, Any]:
+    return {
+        "id": i,
+        "name": _sentence(rng, 2),
+        "active": rng.random() < 0.5,
+        "score": round(rng.uniform(0, 100), 3),
+        "tags": [_word(rng) for _ in range(rng.randint(0, 4))],
+        "parent": None,
+    }
+
+
+def deep(rng: random.Random, size: int, depth: int = 100) -> list[str]:
+    items: list[Any] = []
+    written = 0
+    while written < size:
+        node: Any = _word(rng)
+        for level in range(depth):
+            node = {_word(rng): node} if level % 2 else [node, level]
+        items.append(node)
+        written += len(json.dumps(node))
+    return [json.dumps(items)]
+
+
+def wide(rng: random.Random, size: int) -> list[str]:
+    obj: dict[str, Any] = {}
+    written = 0
+    while written < size:
+        key = f"{_word(rng)}_{len(obj)}"
+        value = rng.choice([rng.randint(-1000, 1000), _word(rng), True, None])
+        obj[key] = value
+        written += len(key) + len(json.dumps(value)) + 6
+    return [json.dumps(obj)]
+
+
+def strings(rng: random.Random, size: int) -> list[str]:
+    items: list[str] = []
+    written = 0
+    while written < size:
+        items.append(_sentence(rng, rng.randint(5, 60)))
+        written += len(items[-1]) + 4
+    return [json.dumps(items)]
+
+
+def numbers(rng: random.Random, size: int) -> list[str]:
+    rows: list[list[int | float]] = []
+    written = 0
+    while written < size:
+        row: list[int | float] = [rng.randint(-(2**31), 2**31) for _ in range(8)]
+        row += [round(rng.uniform(-1000, 1000), 4) for _ in range(8)]
+        rows.append(row)
+        written += len(json.dumps(row))
+    return [json.dumps(rows)]
+
+
+def escapes(rng: random.Random, size: int) -> list[str]:
+    items: list[str] = []
+    written = 0
+    while written < size:
+        parts = [_word(rng) + rng.choice(ESCAPES) for _ in range(rng.randint(4, 20))]
+        items.append("".join(parts))
+        written += len(json.dumps(items[-1])) + 2
+    return [json.dumps(items)]
+
+
+def bulk(rng: random.Random, size: int) -> list[str]:
+    docs: list[str] = []
+    written = 0
+    while written < size:
+        docs.append(json.dumps(_record(rng, len(docs))))
+        written += len(docs[-1])
+    return docs
+
+
+SHAPES: dict[str, Callable[[random.Random, int], list[str]]] = {
+    "deep": deep,
+    "wide": wide,
+    "strings": strings,
+    "numbers": numbers,
+    "escapes": escapes,
+    "bulk": bulk,
+}
+
+
+def generate(shape: str, size: int, seed: int = 0) -> Corpus:
+    return Corpus(shape, SHAPES[shape](random.Random(seed), size))
+
+
+def count_tokens(corpus: Corpus) -> int | None:
+    try:
+        return sum(len(pyson3.lex(doc)) for doc in corpus.docs)
+    except Exception:
+        return None
+
+
+def _time_ns(func: Callable[[Any], Any], docs: list[Any]) -> int:
+    gc.collect()
+    start = perf_counter_ns()
+    for doc in docs:
+        func(doc)
+    return perf_counter_ns() - start
+
+
+def _peak_memory(func: Callable[[Any], Any], docs: list[Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        results = [func(doc) for doc in docs]
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+    return peak
+
+
+def _timings(
+    func: Callable[[Any], Any], docs: list[Any], warmup: int, iterations: int
+) -> list[int]:
+    for _ in range(warmup):
+        _time_ns(func, docs)
+    return [_time_ns(func, docs) for _ in range(iterations)]
+
+
+def run_case(
+    variant: Variant,
+    corpus: Corpus,
+    tokens: int | None,
+    warmup: int,
+    iterations: int,
+    memory: bool = True,
+) -> dict[str, Any]:
+    size = corpus.size
+    result: dict[str, Any] = {
+        "variant": variant.name,
+        "shape": corpus.shape,
+        "bytes": size,
+        "docs": len(corpus.docs),
+        "tokens": tokens,
+    }
+    try:
+        inputs = (
+            [variant.prepare(doc) for doc in corpus.docs]
+            if variant.prepare
+            else corpus.docs
+        )
+        timings = _timings(variant.func, inputs, warmup, iterations)
+        lex_timings = (
+            _timings(variant.lex, corpus.docs, warmup, iterations)
+            if variant.lex
+            else None
+        )
+        peak = _peak_memory(variant.func, inputs) if memory else None
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    median_ns = median(timings)
+    seconds = median_ns / 1e9
+    result |= {
+        "timings_ns": timings,
+        "min_ns": min(timings),
+        "median_ns": median_ns,
+        "mean_ns": mean(timings),
+        "mb_per_s": size / 1e6 / seconds if seconds else None,
+        "tokens_per_s": tokens / seconds if tokens and seconds else None,
+        "peak_memory_bytes": peak,
+        "lex_ns": median(lex_timings) if lex_timings else None,
+        "parse_ns": median_ns - median(lex_timings) if lex_timings else None,
+    }
+    return result
+
+
+def engine_variant(engine: engines.Engine) -> Variant:
+    return Variant(engine.name, engine.loads, prepare=partial(engines.coerce, engine))
+
+
+def report(results: list[dict[str, Any]], config: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "config": config,
+        "results": results,
+    }
+
+
+def run(
+    variants: list[str],
+    shapes: list[str],
+    size: int,
+    warmup: int,
+    iterations: int,
+    seed: int = 0,
+    memory: bool = True,
+) -> dict[str, Any]:
+    results = []
+    for shape in shapes:
+        corpus = generate(shape, size, seed)
+        tokens = count_tokens(corpus)
+        for name in variants:
+            results.append(
+                run_case(VARIANTS[name], corpus, tokens, warmup, iterations, memory)
+            )
+
+    config = {
+        "variants": variants,
+        "shapes": shapes,
+        "size": size,
+        "warmup": warmup,
+        "iterations": iterations,
+        "seed": seed,
+    }
+    return report(results, config)
+
+
+def run_file(
+    path: str,
+    names: list[str],
+    warmup: int,
+    iterations: int,
+    memory: bool = True,
+) -> dict[str, Any]:
+    with open(path, "rb") as f:
+        corpus = Corpus(os.path.basename(path), [f.read().decode("utf8")])
+    tokens = count_tokens(corpus)
+    results = [
+        run_case(
+            engine_variant(engines.get_engine(name)),
+            corpus,
+            tokens,
+            warmup,
+            iterations,
+            memory,
+        )
+        for name in names
+    ]
+    config = {
+        "file": path,
+        "engines": names,
+        "warmup": warmup,
+        "iterations": iterations,
+    }
+    return report(results, config)
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> list[dict[str, Any]]:
+    previous = {
+        (r["variant"], r["shape"]): r for r in baseline["results"] if "error" not in r
+    }
+    regressions = []
+    for r in current["results"]:
+        before = previous.get((r["variant"], r["shape"]))
+        if before is None:
+            continue
+        if "error" in r:
+            regressions.append(
+                {"variant": r["variant"], "shape": r["shape"], "error": r["error"]}
+            )
+            continue
+        ratio = r["median_ns"] / before["median_ns"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                {
+                    "variant": r["variant"],
+                    "shape": r["shape"],
+                    "before_ns": before["median_ns"],
+                    "after_ns": r["median_ns"],
+                    "ratio": ratio,
+                }
+            )
+    return regressions
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("file", nargs="?")
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=list(engines.ENGINES),
+        default=list(engines.ENGINES),
+    )
+    parser.add_argument(
+        "--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS)
+    )
+    parser.add_argument(
+        "--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES)
+    )
+    parser.add_argument("--size", type=int, default=256 * 1024)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--output", "-o")
+    parser.add_argument("--baseline")
+    parser.add_argument("--threshold", type=float, default=0.1)
+
+
+def main(args: argparse.Namespace) -> int:
+    if args.file:
+        result = run_file(
+            args.file, args.engines, args.warmup, args.iterations, not args.no_memory
+        )
+    else:
+        result = run(
+            args.variants,
+            args.shapes,
+            args.size,
+            args.warmup,
+            args.iterations,
+            args.seed,
+            not args.no_memory,
+        )
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    for r in result["results"]:
+        summary = r.get("error") or f"{r['mb_per_s']:8.2f} MB/s"
+        print(f"{r['shape']:>8} {r['variant']:>10} {summary}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf8") as f:
+            regressions = compare(json.load(f), result, args.threshold)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+
+    return 0
@@ -0,0 +1,108 @@
+import copy
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Callable
+
+from . import pyson3
+
+IMMUTABLE = (str, int, float, bool, type(None))
+MODES = ("copy", "frozen")
+MISSING = object()
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+def copy_value(value: Any) -> Any:
+    match value:
+        case dict():
+            return {k: copy_value(v) for k, v in value.items()}
+        case list():
+            return [copy_value(v) for v in value]
+        case _ if isinstance(value, IMMUTABLE):
+            return value
+        case _:
+            return copy.deepcopy(value)
+
+
+def freeze(value: Any) -> Any:
+    match value:
+        case dict():
+            return MappingProxyType({k: freeze(v) for k, v in value.items()})
+        case list():
+            return tuple(freeze(v) for v in value)
+        case _:
+            return value
+
+
+class CachedLoader:
+    def __init__(
+        self,
+        loads: Callable[[Any], Any] = pyson3.loads,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        mode: str = "copy",
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown cache mode {mode}")
+        self.parse = loads
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.entries: OrderedDict[str | bytes, Any] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = Lock()
+
+    def loads(self, json: str | bytes) -> Any:
+        with self.lock:
+            result = self.entries.get(json, MISSING)
+            if result is not MISSING:
+                self.entries.move_to_end(json)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if result is MISSING:
+            result = self.parse(json)
+            if self.mode == "frozen":
+                result = freeze(result)
+            self.store(json, result)
+
+        return result if self.mode == "frozen" else copy_value(result)
+
+    def store(self, json: str | bytes, result: Any) -> None:
+        size = len(json)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+
+        with self.lock:
+            if json in self.entries:
+                return
+            self.entries[json] = result
+            self.bytes += size
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                evicted, _ = self.entries.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def cache_info(self) -> CacheInfo:
+        with self.lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, len(self.entries), self.bytes
+            )
@@ -0,0 +1,129 @@
+from array import array
+from typing import Any
+
+from .direct import DirectParser
+from .index import Index
+from .pyson3 import Value
+from .selector import parse_path
+
+Column = list[Value] | array
+Columns = dict[str, Column]
+
+
+def pack_column(values: list[Any]) -> Column:
+    kinds = set(map(type, values))
+    if kinds == {int}:
+        try:
+            return array("q", values)
+        except OverflowError:
+            return values
+    if kinds == {float} or kinds == {int, float}:
+        return array("d", values)
+    return values
+
+
+def locate(json: str, path: str) -> int:
+    steps = parse_path(path)
+    lookup = [step for step in steps if step is not None]
+    if len(lookup) != len(steps):
+        raise ValueError(f"Wildcards are not supported in columnar paths: {path}")
+    if not lookup:
+        return 0
+
+    index = Index.build(json)
+    return index.tokens.starts[index.find(json, *lookup)]
+
+
+def read_row(parser: DirectParser, columns: dict[str, list[Value]], rows: int) -> int:
+    json = parser.json
+    count = 0
+
+    parser.skip_whitespace()
+    if json[parser.i] == "}":
+        parser.i += 1
+        return count
+
+    while True:
+        parser.skip_whitespace()
+        if json[parser.i] != '"':
+            raise ValueError(parser._error("Expected string key"))
+        key = parser.parse_key()
+        column = columns.get(key)
+        if column is None:
+            column = columns[key] = [None] * rows
+        elif len(column) > rows:
+            raise ValueError(parser._error("Duplicate key found"))
+
+        parser.skip_whitespace()
+        if json[parser.i] != ":":
+            raise ValueError(parser._error("Expected colon"))
+        parser.i += 1
+        column.append(parser.parse_value())
+        count += 1
+
+        parser.skip_whitespace()
+        match json[parser.i]:
+            case ",":
+                parser.i += 1
+            case "}":
+                parser.i += 1
+                return count
+            case _:
+                raise ValueError(parser._error("Expected comma or closing curly"))
+
+
+def read_columns(parser: DirectParser) -> dict[str, list[Value]]:
+    json = parser.json
+    columns: dict[str, list[Value]] = {}
+    rows = 0
+
+    parser.skip_whitespace()
+    if json[parser.i] == "]":
+        parser.i += 1
+        return columns
+
+    while True:
+        parser.skip_whitespace()
+        if json[parser.i] != "{":
+            raise ValueError(parser._error("Expected object row"))
+        parser.i += 1
+
+        count = read_row(parser, columns, rows)
+        rows += 1
+        if count < len(columns):
+            for column in columns.values():
+                if len(column) < rows:
+                    column.append(None)
+
+        parser.skip_whitespace()
+        match json[parser.i]:
+            case ",":
+                parser.i += 1
+            case "]":
+                parser.i += 1
+                return columns
+            case _:
+                raise ValueError(parser._error("Expected comma or closing bracket"))
+
+
+def loads_columnar(json: str, path: str = "$", packed: bool = True) -> Columns:
+    parser = DirectParser()
+    parser.json = json
+    parser.i = start = locate(json, path)
+
+    try:
+        parser.skip_whitespace()
+        if json[parser.i] != "[":
+            raise ValueError(f"Expected array at {path}")
+        parser.i += 1
+        columns = read_columns(parser)
+    except IndexError:
+        raise ValueError(parser._error("Unexpected end of input")) from None
+
+    if start == 0 and json[parser.i :].strip(" \b\t\r\n\f"):
+        raise ValueError(parser._error("Extra data"))
+
+    return {
+        key: pack_column(values) if packed else values
+        for key, values in columns.items()
+    }
@@ -0,0 +1,247 @@
+from .numeric import NUMBERS, check_mode, pack
+from .pyson3 import (
+    JSON,
+    KEY_CACHE_SIZE,
+    NUMERIC,
+    SMALL_INTS,
+    WHITESPACE,
+    Array,
+    Object,
+    ParseFloat,
+    Value,
+    decode_number,
+    is_fractional,
+    unescape,
+)
+
+
+class DirectParser:
+    def __init__(
+        self,
+        key_cache_size: int = KEY_CACHE_SIZE,
+        parse_float: ParseFloat = float,
+        numeric_arrays: str | None = None,
+        value_cache_size: int = 0,
+    ) -> None:
+        check_mode(numeric_arrays)
+        self.key_cache_size = key_cache_size
+        self.parse_float = parse_float
+        self.numeric_arrays = numeric_arrays
+        self.value_cache_size = value_cache_size
+        self.keys: dict[str, str] = {}
+        self.values: dict[str, Value] = {}
+
+    def _error(self, msg: str) -> str:
+        context = self.json[max(self.i - 10, 0) : self.i + 10]
+        return f"{msg}, {self.i=}, {context=}"
+
+    def skip_whitespace(self) -> None:
+        json = self.json
+        i = self.i
+        while json[i] in WHITESPACE:
+            i += 1
+        self.i = i
+
+    def scan_string(self) -> tuple[int, bool]:
+        json = self.json
+        idx = self.i + 1
+        escaped = False
+        end = json.find('"', idx)
+        while True:
+            if end == -1:
+                raise ValueError(self._error("Unterminated string"))
+            backslash = json.find("\\", idx, end)
+            if backslash == -1:
+                break
+            escaped = True
+            idx = backslash + 2
+            if idx > end:
+                end = json.find('"', idx)
+        return end, escaped
+
+    def parse_string(self) -> str:
+        start = self.i + 1
+        end, escaped = self.scan_string()
+        self.i = end + 1
+        string = self.json[start:end]
+        return unescape(string) if escaped else string
+
+    def parse_key(self) -> str:
+        start = self.i + 1
+        end, escaped = self.scan_string()
+        self.i = end + 1
+        raw = self.json[start:end]
+        key = self.keys.get(raw)
+        if key is None:
+            key = unescape(raw) if escaped else raw
+            if len(self.keys) < self.key_cache_size:
+                self.keys[raw] = key
+        return key
+
+    def parse_shared_string(self) -> Value:
+        start = self.i
+        end, escaped = self.scan_string()
+        self.i = end + 1
+        raw = self.json[start : self.i]
+        value = self.values.get(raw)
+        if value is None:
+            value = unescape(raw[1:-1]) if escaped else raw[1:-1]
+            if len(self.values) < self.value_cache_size:
+                self.values[raw] = value
+        return value
+
+    def parse_number(self) -> Value:
+        json = self.json
+        start = i = self.i
+        while json[i] in NUMERIC:
+            i += 1
+        self.i = i
+
+        string = json[start:i]
+        if self.value_cache_size:
+            value = self.values.get(string)
+            if value is None:
+                value = decode_number(string, is_fractional(string), self.parse_float)
+                if len(self.values) < self.value_cache_size:
+                    self.values[string] = value
+            return value
+        if is_fractional(string):
+            return self.parse_float(string)
+        small = SMALL_INTS.get(string)
+        return int(string) if small is None else small
+
+    def parse_literal(self, literal: str, value: Value) -> Value:
+        if not self.json.startswith(literal, self.i):
+            raise ValueError(self._error(f"Invalid {literal} value"))
+        self.i += len(literal)
+        return value
+
+    def parse_value(self) -> Value:
+        self.skip_whitespace()
+        match self.json[self.i]:
+            case '"' if self.value_cache_size:
+                return self.parse_shared_string()
+            case '"':
+                return self.parse_string()
+            case "{":
+                self.i += 1
+                return self.parse_object()
+            case "[":
+                self.i += 1
+                return self.parse_array()
+            case "t":
+                return self.parse_literal("true", True)
+            case "f":
+                return self.parse_literal("false", False)
+            case "n":
+                return self.parse_literal("null", None)
+            case _ as v if v in NUMERIC:
+                return self.parse_number()
+            case _:
+                raise ValueError(self._error("Unexpected character"))
+
+    def parse_object(self) -> Object:
+        result: Object = {}
+        json = self.json
+
+        self.skip_whitespace()
+        if json[self.i] == "}":
+            self.i += 1
+            return result
+
+        while True:
+            self.skip_whitespace()
+            if json[self.i] != '"':
+                raise ValueError(self._error("Expected string key"))
+            key = self.parse_key()
+            if key in result:
+                raise ValueError(self._error("Duplicate key found"))
+
+            self.skip_whitespace()
+            if json[self.i] != ":":
+                raise ValueError(self._error("Expected colon"))
+            self.i += 1
+
+            result[key] = self.parse_value()
+
+            self.skip_whitespace()
+            match json[self.i]:
+                case ",":
+                    self.i += 1
+                case "}":
+                    self.i += 1
+                    return result
+                case _:
+                    raise ValueError(self._error("Expected comma or closing curly"))
+
+    def parse_array(self) -> Array:
+        json = self.json
+        if self.numeric_arrays is not None:
+            m = NUMBERS.match(json, self.i)
+            if m:
+                packed = pack(m.group(1), self.numeric_arrays)
+                if packed is not None:
+                    self.i = m.end()
+                    return packed
+
+        result: Array = []
+
+        self.skip_whitespace()
+        if json[self.i] == "]":
+            self.i += 1
+            return result
+
+        while True:
+            result.append(self.parse_value())
+
+            self.skip_whitespace()
+            match json[self.i]:
+                case ",":
+                    self.i += 1
+                case "]":
+                    self.i += 1
+                    return result
+                case _:
+                    raise ValueError(self._error("Expected comma or closing bracket"))
+
+    def parse(self, json: str) -> JSON:
+        self.json = json
+        self.length = len(json)
+        self.i = 0
+        self.keys = {}
+        self.values = {}
+
+        try:
+            self.skip_whitespace()
+            match json[self.i]:
+                case "{":
+                    self.i += 1
+                    result: JSON = self.parse_object()
+                case "[":
+                    self.i += 1
+                    result = self.parse_array()
+                case _:
+                    raise ValueError(self._error("Invalid input"))
+        except IndexError:
+            raise ValueError(self._error("Unexpected end of input")) from None
+
+        while self.i < self.length:
+            if json[self.i] not in WHITESPACE:
+                raise ValueError(self._error("Extra data"))
+            self.i += 1
+
+        return result
+
+
+def loads(
+    json: str,
+    parse_float: ParseFloat = float,
+    numeric_arrays: str | None = None,
+    value_cache_size: int = 0,
+) -> JSON:
+    parser = DirectParser(
+        parse_float=parse_float,
+        numeric_arrays=numeric_arrays,
+        value_cache_size=value_cache_size,
+    )
+    return parser.parse(json)
@@ -0,0 +1,175 @@
+import re
+from collections.abc import Mapping, Sequence
+from math import isfinite
+from typing import IO, Any, Callable, Iterator
+
+from .pyson3 import ESCAPES, KEY_CACHE_SIZE, Value
+
+NEEDS_ESCAPE = re.compile(r'[\x00-\x1f"\\]')
+ESCAPE_TABLE = {ord(c): f"\\u{ord(c):04x}" for c in map(chr, range(0x20))}
+ESCAPE_TABLE |= {ord(v): "\\" + k for k, v in ESCAPES.items() if k != "/"}
+
+BINARY = (bytes, bytearray, memoryview)
+CHUNK_SIZE = 64 * 1024
+
+Write = Callable[[str], Any]
+
+
+def encode_string(string: str) -> str:
+    if NEEDS_ESCAPE.search(string) is None:
+        return f'"{string}"'
+    return f'"{string.translate(ESCAPE_TABLE)}"'
+
+
+def encode_float(value: float) -> str:
+    if not isfinite(value):
+        raise ValueError(f"Out of range float value {value!r} is not valid JSON")
+    return float.__repr__(value)
+
+
+class ChunkedWriter:
+    def __init__(self, fp: IO[str], chunk_size: int = CHUNK_SIZE) -> None:
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.parts: list[str] = []
+        self.size = 0
+
+    def write(self, part: str) -> None:
+        self.parts.append(part)
+        self.size += len(part)
+        if self.size >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.parts:
+            self.fp.write("".join(self.parts))
+            self.parts.clear()
+            self.size = 0
+
+
+class Encoder:
+    def __init__(self, key_cache_size: int = KEY_CACHE_SIZE) -> None:
+        self.key_cache_size = key_cache_size
+
+    def fallback(self, value: Any) -> Value:
+        match value:
+            case str():
+                return str.__str__(value)
+            case bool():
+                return bool(value)
+            case int():
+                return int(value)
+            case float():
+                return float(value)
+            case dict() | Mapping():
+                return dict(value)
+            case list() | tuple() | Sequence() if not isinstance(value, BINARY):
+                return list(value)
+            case _ if hasattr(value, "tolist") and not isinstance(value, BINARY):
+                return value.tolist()
+            case _:
+                name = type(value).__name__
+                raise TypeError(f"Object of type {name} is not JSON serializable")
+
+    def key(self, keys: dict[str, tuple[str, str]], key: Any) -> tuple[str, str]:
+        if not isinstance(key, str):
+            raise TypeError(f"Keys must be str, not {type(key).__name__}")
+        encoded = encode_string(str.__str__(key)) + ":"
+        forms = encoded, "," + encoded
+        if len(keys) < self.key_cache_size:
+            keys[key] = forms
+        return forms
+
+    def encode(self, value: Any, write: Write) -> None:
+        keys: dict[str, tuple[str, str]] = {}
+        stack: list[tuple[Iterator[Any], str, int]] = []
+        active: set[int] = set()
+        first = False
+
+        while True:
+            t = type(value)
+            if t is str:
+                write(encode_string(value))
+            elif value is None:
+                write("null")
+            elif value is True:
+                write("true")
+            elif value is False:
+                write("false")
+            elif t is int:
+                write(int.__repr__(value))
+            elif t is float:
+                write(encode_float(value))
+            elif t is dict or t is list or t is tuple:
+                is_object = t is dict
+                if not value:
+                    write("{}" if is_object else "[]")
+                else:
+                    marker = id(value)
+                    if marker in active:
+                        raise ValueError("Circular reference detected")
+                    active.add(marker)
+                    items = iter(value.items() if is_object else value)
+                    write("{" if is_object else "[")
+                    stack.append((items, "}" if is_object else "]", marker))
+                    first = True
+            else:
+                value = self.fallback(value)
+                continue
+
+            while stack:
+                items, closer, marker = stack[-1]
+                is_object = closer == "}"
+                for item in items:
+                    if is_object:
+                        key, value = item
+                        forms = keys.get(key) or self.key(keys, key)
+                        write(forms[0] if first else forms[1])
+                    else:
+                        value = item
+                        if not first:
+                            write(",")
+                    first = False
+
+                    t = type(value)
+                    if t is str:
+                        write(encode_string(value))
+                    elif t is int:
+                        write(int.__repr__(value))
+                    elif t is float:
+                        write(encode_float(value))
+                    elif value is None:
+                        write("null")
+                    elif value is True:
+                        write("true")
+                    elif value is False:
+                        write("false")
+                    else:
+                        break
+                else:
+                    write(closer)
+                    stack.pop()
+                    active.discard(marker)
+                    first = False
+                    continue
+                break
+            else:
+                return
+
+    def dumps(self, value: Any) -> str:
+        parts: list[str] = []
+        self.encode(value, parts.append)
+        return "".join(parts)
+
+    def dump(self, value: Any, fp: IO[str], chunk_size: int = CHUNK_SIZE) -> None:
+        writer = ChunkedWriter(fp, chunk_size)
+        self.encode(value, writer.write)
+        writer.flush()
+
+
+def dumps(value: Any) -> str:
+    return Encoder().dumps(value)
+
+
+def dump(value: Any, fp: IO[str], chunk_size: int = CHUNK_SIZE) -> None:
+    Encoder().dump(value, fp, chunk_size)
@@ -0,0 +1,133 @@
+import argparse
+import os
+import sys
+from dataclasses import dataclass
+from functools import partial
+from time import perf_counter_ns
+from typing import Any, Callable
+
+from . import (
+    direct,
+    encoder,
+    incremental,
+    iterative,
+    mapped,
+    pyson2,
+    pyson3,
+    stream,
+)
+
+Input = str | bytes | bytearray
+
+AUTO = "auto"
+ENV_VAR = "PYSON_ENGINE"
+MAPPED_THRESHOLD = 32 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Engine:
+    name: str
+    loads: Callable[[Any], Any]
+    accepts_bytes: bool = False
+    requires_bytes: bool = False
+
+
+ENGINES: dict[str, Engine] = {}
+
+
+def register(
+    name: str,
+    loads: Callable[[Any], Any],
+    accepts_bytes: bool = False,
+    requires_bytes: bool = False,
+) -> Engine:
+    if name == AUTO:
+        raise ValueError(f"Engine name {AUTO} is reserved")
+    engine = Engine(name, loads, accepts_bytes or requires_bytes, requires_bytes)
+    ENGINES[name] = engine
+    return engine
+
+
+def get_engine(name: str) -> Engine:
+    engine = ENGINES.get(name)
+    if engine is None:
+        raise ValueError(f"Unknown engine {name}")
+    return engine
+
+
+register("pyson2", pyson2.loads)
+register("tokens", pyson3.loads)
+register("regex", partial(pyson3.loads, engine="regex"))
+register("stream", stream.loads)
+register("iterative", iterative.loads)
+register("direct", direct.loads)
+register("mapped", mapped.loads, requires_bytes=True)
+register("incremental", incremental.loads, accepts_bytes=True)
+
+
+def select(json: Input) -> Engine:
+    if not isinstance(json, str) and len(json) >= MAPPED_THRESHOLD:
+        return ENGINES["mapped"]
+    return ENGINES["direct"]
+
+
+def configured(engine: str | None = None) -> str:
+    return engine or os.environ.get(ENV_VAR) or AUTO
+
+
+def decode(json: Input) -> str:
+    return json if isinstance(json, str) else json.decode("utf8")
+
+
+def coerce(engine: Engine, json: Input) -> Input:
+    if isinstance(json, str):
+        return json.encode("utf8") if engine.requires_bytes else json
+    return json if engine.accepts_bytes else decode(json)
+
+
+def parse(json: Input, engine: str | None = None) -> tuple[Engine, Any]:
+    name = configured(engine)
+    selected = select(json) if name == AUTO else get_engine(name)
+    try:
+        return selected, selected.loads(coerce(selected, json))
+    except RecursionError:
+        if name != AUTO:
+            raise
+        fallback = ENGINES["iterative"]
+        return fallback, fallback.loads(decode(json))
+
+
+def loads(json: Input, engine: str | None = None) -> Any:
+    return parse(json, engine)[1]
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("file")
+    parser.add_argument("--engine", choices=[AUTO, *ENGINES])
+    parser.add_argument("--output", "-o")
+    parser.add_argument("--quiet", "-q", action="store_true")
+
+
+def main(args: argparse.Namespace) -> int:
+    if args.file == "-":
+        json = sys.stdin.buffer.read()
+    else:
+        with open(args.file, "rb") as f:
+            json = f.read()
+
+    start = perf_counter_ns()
+    try:
+        engine, result = parse(json, args.engine)
+    except (ValueError, IndexError, RecursionError) as e:
+        print(f"error: {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    elapsed = perf_counter_ns() - start
+
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as f:
+            encoder.dump(result, f)
+    elif not args.quiet:
+        print(encoder.dumps(result))
+
+    print(f"{engine.name}: {len(json)} bytes in {elapsed / 1e6:.2f} ms", file=sys.stderr)
+    return 0
@@ -0,0 +1,320 @@
+import codecs
+import re
+from enum import Enum, auto
+from typing import IO, AnyStr
+
+from .pyson3 import (
+    JSON,
+    NUMERIC,
+    WHITESPACE,
+    Array,
+    Object,
+    TokenType,
+    Value,
+    decode_number,
+    is_fractional,
+    unescape,
+)
+
+STRING_STOP = re.compile(r'["\\]')
+ESCAPABLE = set('"\\/bfnrtu')
+LITERALS: dict[str, tuple[str, Value]] = {
+    "t": ("true", True),
+    "f": ("false", False),
+    "n": ("null", None),
+}
+PUNCTUATION: dict[str, TokenType] = {
+    "{": TokenType.L_CURLY,
+    "}": TokenType.R_CURLY,
+    "[": TokenType.L_BRACKET,
+    "]": TokenType.R_BRACKET,
+    ":": TokenType.COLON,
+    ",": TokenType.COMMA,
+}
+SCALARS = {TokenType.STRING, TokenType.NUMBER, TokenType.BOOLEAN, TokenType.NULL}
+
+Lexeme = tuple[TokenType, Value]
+
+
+class LexState(Enum):
+    DEFAULT = auto()
+    STRING = auto()
+    NUMBER = auto()
+    LITERAL = auto()
+
+
+class Expect(Enum):
+    VALUE = auto()
+    FIRST_VALUE = auto()
+    KEY = auto()
+    FIRST_KEY = auto()
+    COLON = auto()
+    SEPARATOR = auto()
+    END = auto()
+
+
+class IncrementalLexer:
+    def __init__(self) -> None:
+        self.state = LexState.DEFAULT
+        self.parts: list[str] = []
+        self.escape = False
+        self.literal = ""
+        self.decoder = codecs.getincrementaldecoder("utf8")()
+
+    def feed(self, chunk: str | bytes) -> list[Lexeme]:
+        if isinstance(chunk, bytes):
+            chunk = self.decoder.decode(chunk)
+
+        lexemes: list[Lexeme] = []
+        total_len = len(chunk)
+
+        i = 0
+        match self.state:
+            case LexState.STRING:
+                i = self.scan_string(chunk, i, lexemes)
+            case LexState.NUMBER:
+                i = self.scan_number(chunk, i, lexemes)
+            case LexState.LITERAL:
+                i = self.scan_literal(chunk, i, lexemes)
+
+        while i < total_len:
+            value = chunk[i]
+            if value in PUNCTUATION:
+                lexemes.append((PUNCTUATION[value], None))
+                i += 1
+            elif value in WHITESPACE:
+                i += 1
+            elif value == '"':
+                i = self.scan_string(chunk, i + 1, lexemes)
+            elif value in LITERALS:
+                self.literal = ""
+                i = self.scan_literal(chunk, i, lexemes)
+            elif value in NUMERIC:
+                i = self.scan_number(chunk, i, lexemes)
+            else:
+                raise ValueError(f"Unexpected character {value!r}")
+
+        return lexemes
+
+    def close(self) -> list[Lexeme]:
+        lexemes: list[Lexeme] = []
+        if tail := self.decoder.decode(b"", final=True):
+            lexemes += self.feed(tail)
+
+        match self.state:
+            case LexState.NUMBER:
+                lexemes.append(self.number())
+            case LexState.STRING:
+                raise ValueError("Unterminated string")
+            case LexState.LITERAL:
+                raise ValueError(f"Incomplete literal {self.literal!r}")
+        return lexemes
+
+    def scan_string(self, chunk: str, i: int, lexemes: list[Lexeme]) -> int:
+        self.state = LexState.STRING
+        parts = self.parts
+        total_len = len(chunk)
+
+        while True:
+            if self.escape:
+                if i == total_len:
+                    return i
+                if chunk[i] not in ESCAPABLE:
+                    raise ValueError("Invalid string escaping")
+                parts.append(chunk[i])
+                self.escape = False
+                i += 1
+
+            m = STRING_STOP.search(chunk, i)
+            if m is None:
+                parts.append(chunk[i:])
+                return total_len
+
+            idx = m.start()
+            parts.append(chunk[i:idx])
+            if chunk[idx] == '"':
+                string = "".join(parts)
+                lexemes.append((TokenType.STRING, unescape(string)))
+                parts.clear()
+                self.state = LexState.DEFAULT
+                return idx + 1
+
+            parts.append("\\")
+            self.escape = True
+            i = idx + 1
+
+    def scan_number(self, chunk: str, i: int, lexemes: list[Lexeme]) -> int:
+        self.state = LexState.NUMBER
+        total_len = len(chunk)
+
+        start = i
+        while i < total_len and chunk[i] in NUMERIC:
+            i += 1
+        self.parts.append(chunk[start:i])
+
+        if i < total_len:
+            lexemes.append(self.number())
+        return i
+
+    def number(self) -> Lexeme:
+        string = "".join(self.parts)
+        self.parts.clear()
+        self.state = LexState.DEFAULT
+
+        return TokenType.NUMBER, decode_number(string, is_fractional(string))
+
+    def scan_literal(self, chunk: str, i: int, lexemes: list[Lexeme]) -> int:
+        self.state = LexState.LITERAL
+        expected, value = LITERALS[self.literal[:1] or chunk[i]]
+
+        piece = chunk[i : i + len(expected) - len(self.literal)]
+        self.literal += piece
+        if not expected.startswith(self.literal):
+            raise ValueError(f"Invalid {expected} value")
+
+        if self.literal == expected:
+            token = TokenType.NULL if value is None else TokenType.BOOLEAN
+            lexemes.append((token, value))
+            self.state = LexState.DEFAULT
+        return i + len(piece)
+
+
+class Grammar:
+    def __init__(self) -> None:
+        self.lexer = IncrementalLexer()
+        self.objects: list[bool] = []
+        self.expect = Expect.VALUE
+
+    def _error(self, msg: str, token: TokenType) -> str:
+        expected = self.expect.name
+        return f"{msg}, {token=}, {expected=}, depth={len(self.objects)}"
+
+    def feed(self, chunk: str | bytes) -> None:
+        for token, value in self.lexer.feed(chunk):
+            self.push(token, value)
+
+    def finish(self) -> None:
+        for token, value in self.lexer.close():
+            self.push(token, value)
+
+        if self.expect != Expect.END:
+            raise ValueError("Unexpected end of input")
+
+    def on_start(self, is_object: bool) -> None:
+        pass
+
+    def on_end(self, is_object: bool) -> None:
+        pass
+
+    def on_key(self, key: str) -> None:
+        pass
+
+    def on_scalar(self, token: TokenType, value: Value) -> None:
+        pass
+
+    def start(self, is_object: bool) -> None:
+        self.on_start(is_object)
+        self.objects.append(is_object)
+        self.expect = Expect.FIRST_KEY if is_object else Expect.FIRST_VALUE
+
+    def end(self, token: TokenType) -> None:
+        is_object = self.objects.pop()
+        if is_object != (token == TokenType.R_CURLY):
+            raise ValueError(self._error("Mismatched closing token", token))
+
+        self.on_end(is_object)
+        self.expect = Expect.SEPARATOR if self.objects else Expect.END
+
+    def push(self, token: TokenType, value: Value) -> None:
+        match self.expect:
+            case Expect.VALUE | Expect.FIRST_VALUE:
+                match token:
+                    case TokenType.L_CURLY:
+                        self.start(True)
+                    case TokenType.L_BRACKET:
+                        self.start(False)
+                    case TokenType.R_BRACKET if self.expect == Expect.FIRST_VALUE:
+                        self.end(token)
+                    case _ if token in SCALARS and self.objects:
+                        self.on_scalar(token, value)
+                        self.expect = Expect.SEPARATOR
+                    case _:
+                        raise ValueError(self._error("Expected value", token))
+            case Expect.KEY | Expect.FIRST_KEY:
+                match token:
+                    case TokenType.STRING:
+                        assert isinstance(value, str)  # mypy fix
+                        self.on_key(value)
+                        self.expect = Expect.COLON
+                    case TokenType.R_CURLY if self.expect == Expect.FIRST_KEY:
+                        self.end(token)
+                    case _:
+                        raise ValueError(self._error("Expected string key", token))
+            case Expect.COLON:
+                if token != TokenType.COLON:
+                    raise ValueError(self._error("Expected colon", token))
+                self.expect = Expect.VALUE
+            case Expect.SEPARATOR:
+                match token:
+                    case TokenType.COMMA:
+                        is_object = self.objects[-1]
+                        self.expect = Expect.KEY if is_object else Expect.VALUE
+                    case TokenType.R_CURLY | TokenType.R_BRACKET:
+                        self.end(token)
+                    case _:
+                        raise ValueError(self._error("Expected comma", token))
+            case Expect.END:
+                raise ValueError(self._error("Extra data", token))
+
+
+class IncrementalParser(Grammar):
+    def __init__(self) -> None:
+        super().__init__()
+        self.stack: list[Object | Array] = []
+        self.keys: list[str] = []
+        self.result: JSON | None = None
+
+    def close(self) -> JSON:
+        self.finish()
+        assert self.result is not None  # mypy fix
+        return self.result
+
+    def add(self, value: Value) -> None:
+        top = self.stack[-1]
+        if isinstance(top, dict):
+            top[self.keys.pop()] = value
+        else:
+            top.append(value)
+
+    def on_start(self, is_object: bool) -> None:
+        container: Object | Array = {} if is_object else []
+        if self.stack:
+            self.add(container)
+        self.stack.append(container)
+
+    def on_end(self, is_object: bool) -> None:
+        container = self.stack.pop()
+        if not self.stack:
+            self.result = container
+
+    def on_key(self, key: str) -> None:
+        if key in self.stack[-1]:
+            raise ValueError(self._error("Duplicate key found", TokenType.STRING))
+        self.keys.append(key)
+
+    def on_scalar(self, token: TokenType, value: Value) -> None:
+        self.add(value)
+
+
+def load(fp: IO[AnyStr], chunk_size: int = 64 * 1024) -> JSON:
+    parser = IncrementalParser()
+    while chunk := fp.read(chunk_size):
+        parser.feed(chunk)
+    return parser.close()
+
+
+def loads(json: str | bytes, chunk_size: int = 64 * 1024) -> JSON:
+    parser = IncrementalParser()
+    for i in range(0, len(json), chunk_size):
+        parser.feed(json[i : i + chunk_size])
+    return parser.close()
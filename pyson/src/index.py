@@ -0,0 +1,185 @@
+import struct
+import sys
+import zlib
+from array import array
+from typing import BinaryIO
+
+from .pyson3 import Value, unescape
+from .stream import Op, StreamParser, TokenStream, lex
+
+MAGIC = b"PYSONIDX"
+VERSION = 3
+HEADER = struct.Struct("<BBqqI")
+
+Step = str | int
+
+
+def checksum(json: str) -> int:
+    return zlib.crc32(json.encode("utf8", "surrogatepass"))
+
+
+class Index:
+    def __init__(
+        self,
+        tokens: TokenStream,
+        tape: array,
+        counts: array,
+        source_length: int,
+        checksum: int,
+    ) -> None:
+        self.tokens = tokens
+        self.tape = tape
+        self.counts = counts
+        self.source_length = source_length
+        self.checksum = checksum
+        self.verified: str | None = None
+
+    @classmethod
+    def build(cls, json: str) -> "Index":
+        tokens = lex(json)
+        types = tokens.types
+        total = len(types)
+        tape = array("q", bytes(8 * total))
+        counts = array("q", bytes(8 * total))
+
+        stack: list[int] = []
+        for i, t in enumerate(types):
+            if stack:
+                parent = stack[-1]
+                if types[parent] == Op.L_CURLY:
+                    if t == Op.COLON:
+                        counts[parent] += 1
+                elif t != Op.COMMA and t != Op.R_BRACKET:
+                    counts[parent] += 1
+
+            match t:
+                case Op.L_CURLY | Op.L_BRACKET:
+                    stack.append(i)
+                case Op.R_CURLY | Op.R_BRACKET:
+                    if not stack:
+                        raise ValueError(f"Unmatched closing token at {tokens[i]}")
+                    opener = stack.pop()
+                    if (types[opener] == Op.L_CURLY) != (t == Op.R_CURLY):
+                        raise ValueError(f"Mismatched closing token at {tokens[i]}")
+                    tape[opener] = i
+                    tape[i] = opener
+
+        if stack:
+            raise ValueError(f"Unclosed container at {tokens[stack[-1]]}")
+        if total < 2 or types[0] not in (Op.L_CURLY, Op.L_BRACKET):
+            raise ValueError("Invalid input")
+
+        index = cls(tokens, tape, counts, len(json), checksum(json))
+        index.verified = json
+        return index
+
+    def check(self, json: str) -> None:
+        if json is self.verified:
+            return
+        if len(json) != self.source_length or checksum(json) != self.checksum:
+            raise ValueError("Index does not match document")
+        self.verified = json
+
+    def next(self, i: int) -> int:
+        types = self.tokens.types
+        if types[i] == Op.L_CURLY or types[i] == Op.L_BRACKET:
+            i = self.tape[i]
+        i += 1
+        if i < len(types) and types[i] == Op.COMMA:
+            i += 1
+        return i
+
+    def count(self, i: int = 0) -> int:
+        return self.counts[i]
+
+    def find(self, json: str, *steps: Step) -> int:
+        self.check(json)
+        types = self.tokens.types
+        starts = self.tokens.starts
+        ends = self.tokens.ends
+        flags = self.tokens.flags
+
+        i = 0
+        for step in steps:
+            if isinstance(step, str):
+                if types[i] != Op.L_CURLY:
+                    raise TypeError(f"Cannot look up key {step!r} in non-object")
+                end = self.tape[i]
+                j = i + 1
+                while j < end:
+                    key = json[starts[j] + 1 : ends[j] - 1]
+                    if flags[j]:
+                        key = unescape(key)
+                    if key == step:
+                        break
+                    j = self.next(j + 2)
+                else:
+                    raise KeyError(step)
+                i = j + 2
+            else:
+                if types[i] != Op.L_BRACKET:
+                    raise TypeError(f"Cannot look up index {step} in non-array")
+                count = self.counts[i]
+                position = step + count if step < 0 else step
+                if not 0 <= position < count:
+                    raise IndexError(step)
+                i += 1
+                for _ in range(position):
+                    i = self.next(i)
+        return i
+
+    def get(self, json: str, *steps: Step) -> Value:
+        i = self.find(json, *steps)
+        parser = StreamParser()
+        if i == 0:
+            return parser.parse_tokens(json, self.tokens)
+
+        parser.reset(json, self.tokens)
+        parser.i = i
+        return parser.parse_value()
+
+    def dump(self, fp: BinaryIO) -> None:
+        fp.write(MAGIC)
+        little = sys.byteorder == "little"
+        fp.write(
+            HEADER.pack(
+                VERSION, little, len(self.tape), self.source_length, self.checksum
+            )
+        )
+        fp.write(self.tokens.types)
+        fp.write(self.tokens.flags)
+        for values in (self.tokens.starts, self.tokens.ends, self.tape, self.counts):
+            values.tofile(fp)
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> "Index":
+        if fp.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a pyson index file")
+        header = fp.read(HEADER.size)
+        version = header[0] if header else None
+        if version != VERSION:
+            raise ValueError(f"Unsupported index version {version}")
+        _, little, total, source_length, crc = HEADER.unpack(header)
+
+        types = bytearray(fp.read(total))
+        flags = bytearray(fp.read(total))
+        columns = []
+        for _ in range(4):
+            values = array("q")
+            values.fromfile(fp, total)
+            if bool(little) != (sys.byteorder == "little"):
+                values.byteswap()
+            columns.append(values)
+
+        starts, ends, tape, counts = columns
+        tokens = TokenStream(types, starts, ends, flags)
+        return cls(tokens, tape, counts, source_length, crc)
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            self.dump(f)
+
+    @classmethod
+    def open(cls, path: str) -> "Index":
+        with open(path, "rb") as f:
+            return cls.load(f)
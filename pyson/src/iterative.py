@@ -0,0 +1,237 @@
+import re
+from typing import Any
+
+from .pyson3 import JSON, KEY_CACHE_SIZE, SMALL_INTS, ParseFloat, unescape
+from .stream import OPCODES, Op, StreamParser, TokenStream
+
+MAX_DEPTH = 10_000
+
+INTEGER = r"-?(?:0|[1-9][0-9]*)"
+TOKEN = re.compile(
+    rf"""
+    [ \t\r\n]*
+    (?:
+        (?P<L_CURLY>\{{)
+      | (?P<R_CURLY>\}})
+      | (?P<L_BRACKET>\[)
+      | (?P<R_BRACKET>\])
+      | (?P<COLON>:)
+      | (?P<COMMA>,)
+      | (?P<STRING>"[^"\\\x00-\x1f]*")
+      | (?P<ESCAPED>
+            "[^"\\\x00-\x1f]*
+            (?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{{4}})[^"\\\x00-\x1f]*)+
+            "
+        )
+      | (?P<NUMBER>{INTEGER}(?![0-9.eE+\-]))
+      | (?P<FLOAT>{INTEGER}(?:\.[0-9]+)?(?:[eE][+\-]?[0-9]+)?(?![0-9.eE+\-]))
+      | (?P<BOOLEAN>true|false)
+      | (?P<NULL>null)
+    )?
+    """,
+    re.VERBOSE,
+)
+
+VALUE = 0
+FIRST_VALUE = 1
+KEY = 2
+FIRST_KEY = 3
+AFTER = 4
+
+
+def lex(json: str) -> TokenStream:
+    stream = TokenStream()
+    add_type = stream.types.append
+    add_start = stream.starts.append
+    add_end = stream.ends.append
+    add_flag = stream.flags.append
+    match_token = TOKEN.match
+    opcodes = OPCODES
+    total_len = len(json)
+
+    i = 0
+    while i < total_len:
+        m = match_token(json, i)
+        assert m  # mypy fix
+        kind = m.lastgroup
+        if kind is None:
+            i = m.end()
+            if i < total_len:
+                raise ValueError(f"Unexpected character {json[i]!r} at {i}")
+            break
+
+        start, i = m.span(kind)
+        add_type(opcodes[kind])
+        add_start(start)
+        add_end(i)
+        add_flag(kind == "ESCAPED" or kind == "FLOAT")
+
+    return stream
+
+
+class IterativeParser(StreamParser):
+    def __init__(
+        self,
+        max_depth: int = MAX_DEPTH,
+        key_cache_size: int = KEY_CACHE_SIZE,
+        parse_float: ParseFloat = float,
+        numeric_arrays: str | None = None,
+        value_cache_size: int = 0,
+    ) -> None:
+        super().__init__(key_cache_size, parse_float, numeric_arrays, value_cache_size)
+        self.max_depth = max_depth
+
+    def parse(self, json: str) -> JSON:
+        return self.parse_tokens(json, lex(json))
+
+    def fail(self, i: int, msg: str) -> ValueError:
+        self.i = i
+        return ValueError(self._error(msg))
+
+    def parse_tokens(self, json: str, tokens: TokenStream) -> JSON:
+        self.reset(json, tokens)
+        types = self.types
+        starts = self.starts
+        ends = self.ends
+        flags = self.flags
+        keys = self.keys
+        key_cache_size = self.key_cache_size
+        parse_float = self.parse_float
+        max_depth = self.max_depth
+        numeric_arrays = self.numeric_arrays
+        value_cache_size = self.value_cache_size
+        length = self.length
+
+        if length < 2:
+            raise ValueError(self._error("Too short to be valid"))
+
+        root: JSON
+        match types[0]:
+            case Op.L_CURLY:
+                root = {}
+                state = FIRST_KEY
+            case Op.L_BRACKET:
+                root = []
+                state = FIRST_VALUE
+            case _:
+                raise ValueError(self._error("Invalid input"))
+
+        stack: list[Any] = [root]
+        top: Any = root
+        in_object = isinstance(root, dict)
+        key: str | None = None
+        value: Any
+
+        i = 1
+        while i < length:
+            op = types[i]
+
+            if state == AFTER:
+                if op == Op.COMMA:
+                    state = KEY if in_object else VALUE
+                    i += 1
+                    continue
+                if op != (Op.R_CURLY if in_object else Op.R_BRACKET):
+                    expected = "curly" if in_object else "bracket"
+                    raise self.fail(i, f"Expected comma or closing {expected}")
+            elif state == KEY or state == FIRST_KEY:
+                if op == Op.STRING:
+                    raw = json[starts[i] + 1 : ends[i] - 1]
+                    key = keys.get(raw)
+                    if key is None:
+                        key = unescape(raw) if flags[i] else raw
+                        if len(keys) < key_cache_size:
+                            keys[raw] = key
+                    if key in top:
+                        raise self.fail(i, "Duplicate key found")
+                    if i + 1 >= length or types[i + 1] != Op.COLON:
+                        raise self.fail(i + 1, "Expected colon")
+                    state = VALUE
+                    i += 2
+                    continue
+                if state == KEY or op != Op.R_CURLY:
+                    raise self.fail(i, "Expected string key")
+            elif state == VALUE or op != Op.R_BRACKET:
+                match op:
+                    case Op.STRING | Op.NUMBER if value_cache_size:
+                        value = self.shared_value(i)
+                        state = AFTER
+                    case Op.STRING:
+                        value = json[starts[i] + 1 : ends[i] - 1]
+                        if flags[i]:
+                            value = unescape(value)
+                        state = AFTER
+                    case Op.NUMBER:
+                        string = json[starts[i] : ends[i]]
+                        if flags[i]:
+                            value = parse_float(string)
+                        else:
+                            value = SMALL_INTS.get(string)
+                            if value is None:
+                                value = int(string)
+                        state = AFTER
+                    case Op.L_CURLY:
+                        value = {}
+                        state = FIRST_KEY
+                    case Op.L_BRACKET:
+                        self.i = i + 1
+                        packed = self.parse_numeric_array() if numeric_arrays else None
+                        if packed is not None:
+                            value = packed
+                            state = AFTER
+                            i = self.i - 1
+                        else:
+                            value = []
+                            state = FIRST_VALUE
+                    case Op.BOOLEAN:
+                        value = json[starts[i]] == "t"
+                        state = AFTER
+                    case Op.NULL:
+                        value = None
+                        state = AFTER
+                    case _:
+                        raise self.fail(i, "Expected value")
+
+                if in_object:
+                    top[key] = value
+                else:
+                    top.append(value)
+
+                if state != AFTER:
+                    if len(stack) >= max_depth:
+                        raise self.fail(i, f"Maximum depth {max_depth} exceeded")
+                    stack.append(value)
+                    top = value
+                    in_object = state == FIRST_KEY
+                i += 1
+                continue
+
+            stack.pop()
+            i += 1
+            if not stack:
+                break
+            top = stack[-1]
+            in_object = isinstance(top, dict)
+            state = AFTER
+
+        if stack:
+            raise self.fail(length, "Unexpected end of input")
+        if i != length:
+            raise self.fail(i, "Extra data")
+        return root
+
+
+def loads(
+    json: str,
+    max_depth: int = MAX_DEPTH,
+    parse_float: ParseFloat = float,
+    numeric_arrays: str | None = None,
+    value_cache_size: int = 0,
+) -> JSON:
+    parser = IterativeParser(
+        max_depth,
+        parse_float=parse_float,
+        numeric_arrays=numeric_arrays,
+        value_cache_size=value_cache_size,
+    )
+    return parser.parse(json)
@@ -0,0 +1,108 @@
+from typing import IO, Iterator
+
+from .incremental import Grammar
+from .pyson3 import Array, Object, TokenType, Value
+
+Event = tuple[str, str, Value]
+Source = str | bytes | IO[str] | IO[bytes]
+
+SCALAR_EVENTS: dict[TokenType, str] = {
+    TokenType.STRING: "string",
+    TokenType.NUMBER: "number",
+    TokenType.BOOLEAN: "boolean",
+    TokenType.NULL: "null",
+}
+
+
+def join(prefix: str, name: str) -> str:
+    return f"{prefix}.{name}" if prefix else name
+
+
+class EventParser(Grammar):
+    def __init__(self) -> None:
+        super().__init__()
+        self.events: list[Event] = []
+        self.bases: list[str] = []
+        self.prefix = ""
+
+    def drain(self) -> list[Event]:
+        events, self.events = self.events, []
+        return events
+
+    def on_start(self, is_object: bool) -> None:
+        prefix = self.prefix
+        self.events.append((prefix, "start_map" if is_object else "start_array", None))
+        self.bases.append(prefix)
+        if not is_object:
+            self.prefix = join(prefix, "item")
+
+    def on_end(self, is_object: bool) -> None:
+        prefix = self.bases.pop()
+        self.events.append((prefix, "end_map" if is_object else "end_array", None))
+        self.prefix = prefix
+
+    def on_key(self, key: str) -> None:
+        base = self.bases[-1]
+        self.events.append((base, "map_key", key))
+        self.prefix = join(base, key)
+
+    def on_scalar(self, token: TokenType, value: Value) -> None:
+        self.events.append((self.prefix, SCALAR_EVENTS[token], value))
+
+
+def chunks(source: Source, chunk_size: int) -> Iterator[str | bytes]:
+    if isinstance(source, (str, bytes)):
+        for i in range(0, len(source), chunk_size):
+            yield source[i : i + chunk_size]
+        return
+
+    read = source.read
+    while chunk := read(chunk_size):
+        yield chunk
+
+
+def iterparse(source: Source, chunk_size: int = 64 * 1024) -> Iterator[Event]:
+    parser = EventParser()
+    for chunk in chunks(source, chunk_size):
+        parser.feed(chunk)
+        yield from parser.drain()
+
+    parser.finish()
+    yield from parser.drain()
+
+
+def items(source: Source, prefix: str, chunk_size: int = 64 * 1024) -> Iterator[Value]:
+    stack: list[Object | Array] = []
+    keys: list[str] = []
+
+    def add(value: Value) -> None:
+        top = stack[-1]
+        if isinstance(top, dict):
+            top[keys.pop()] = value
+        else:
+            top.append(value)
+
+    for path, event, value in iterparse(source, chunk_size):
+        if not stack and path != prefix:
+            continue
+
+        match event:
+            case "start_map" | "start_array":
+                container: Object | Array = {} if event == "start_map" else []
+                if stack:
+                    add(container)
+                stack.append(container)
+                continue
+            case "end_map" | "end_array":
+                value = stack.pop()
+                if stack:
+                    continue
+            case "map_key":
+                assert isinstance(value, str)  # mypy fix
+                keys.append(value)
+                continue
+            case _ if stack:
+                add(value)
+                continue
+
+        yield value
@@ -0,0 +1,164 @@
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any, overload
+
+from .pyson3 import JSON, Value
+from .stream import Op, StreamParser, lex
+
+LazyValue = Value | "LazyObject" | "LazyArray"
+
+
+class LazyDocument:
+    def __init__(self, json: str) -> None:
+        self.parser = StreamParser()
+        self.parser.reset(json, lex(json))
+
+        if self.parser.length < 2:
+            raise ValueError(self.parser._error("Too short to be valid"))
+
+    def root(self) -> "LazyObject | LazyArray":
+        match self.parser.types[0]:
+            case Op.L_CURLY:
+                return LazyObject(self, 0)
+            case Op.L_BRACKET:
+                return LazyArray(self, 0)
+            case _:
+                raise ValueError(self.parser._error("Invalid input"))
+
+    def value_at(self, i: int) -> LazyValue:
+        parser = self.parser
+        match parser.types[i]:
+            case Op.L_CURLY:
+                return LazyObject(self, i)
+            case Op.L_BRACKET:
+                return LazyArray(self, i)
+            case _:
+                parser.i = i
+                return parser.parse_value()
+
+    def children(self, start: int, closing: int) -> Iterator[int]:
+        parser = self.parser
+        types = parser.types
+        parser.i = start + 1
+        while parser.i < parser.length and types[parser.i] != closing:
+            yield parser.i
+            parser.skip_value()
+
+        if parser.i >= parser.length:
+            raise ValueError(parser._error("Unexpected end of input"))
+
+
+class LazyObject(Mapping[str, LazyValue]):
+    def __init__(self, document: LazyDocument, start: int) -> None:
+        self._document = document
+        self._start = start
+        self._slots: dict[str, int] | None = None
+        self._cache: dict[str, LazyValue] = {}
+
+    def _index(self) -> dict[str, int]:
+        if self._slots is not None:
+            return self._slots
+
+        parser = self._document.parser
+        types = parser.types
+        slots: dict[str, int] = {}
+        for i in self._document.children(self._start, Op.R_CURLY):
+            if types[i] != Op.STRING:
+                raise ValueError(parser._error("Invalid object content"))
+            key = parser.normalized_string(i)
+            if key in slots:
+                raise ValueError(parser._error("Duplicate key found"))
+            if types[i + 1] != Op.COLON:
+                raise ValueError(parser._error("Expected colon"))
+            slots[key] = i + 2
+            parser.i = i + 2
+
+        self._slots = slots
+        return slots
+
+    def __getitem__(self, key: str) -> LazyValue:
+        if key in self._cache:
+            return self._cache[key]
+
+        value = self._document.value_at(self._index()[key])
+        self._cache[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index())
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index()
+
+    def __repr__(self) -> str:
+        return f"LazyObject({materialize(self)!r})"
+
+
+class LazyArray(Sequence[LazyValue]):
+    def __init__(self, document: LazyDocument, start: int) -> None:
+        self._document = document
+        self._start = start
+        self._slots: list[int] | None = None
+        self._cache: dict[int, LazyValue] = {}
+
+    def _index(self) -> list[int]:
+        if self._slots is None:
+            self._slots = list(self._document.children(self._start, Op.R_BRACKET))
+        return self._slots
+
+    @overload
+    def __getitem__(self, index: int) -> LazyValue:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[LazyValue]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> LazyValue | list[LazyValue]:
+        slots = self._index()
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(slots)))]
+
+        if index < 0:
+            index += len(slots)
+        if index in self._cache:
+            return self._cache[index]
+
+        if not 0 <= index < len(slots):
+            raise IndexError("LazyArray index out of range")
+        value = self._document.value_at(slots[index])
+        self._cache[index] = value
+        return value
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"LazyArray({materialize(self)!r})"
+
+
+def materialize(value: LazyValue) -> Value:
+    match value:
+        case LazyObject():
+            return {key: materialize(item) for key, item in value.items()}
+        case LazyArray():
+            return [materialize(item) for item in value]
+        case _:
+            return value
+
+
+def lazy_loads(json: str) -> LazyObject | LazyArray:
+    return LazyDocument(json).root()
+
+
+def loads(json: str) -> JSON:
+    result = materialize(lazy_loads(json))
+    assert isinstance(result, (dict, list))  # mypy fix
+    return result
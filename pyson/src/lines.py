@@ -0,0 +1,79 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Iterator
+
+from .direct import DirectParser
+from .pyson3 import JSON
+
+Range = tuple[int, int]
+
+
+def ranges(path: str | os.PathLike[str], chunk_size: int) -> list[Range]:
+    size = os.path.getsize(path)
+    result: list[Range] = []
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            end = min(start + chunk_size, size)
+            if end < size:
+                f.seek(end)
+                line = f.readline()
+                end += len(line)
+            result.append((start, end))
+            start = end
+    return result
+
+
+def parse_range(path: str | os.PathLike[str], start: int, end: int) -> list[JSON]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    parser = DirectParser()
+    results: list[JSON] = []
+    offset = start
+    for line in data.split(b"\n"):
+        if line.strip():
+            try:
+                results.append(parser.parse(line.decode("utf8")))
+            except ValueError as e:
+                raise ValueError(f"{e}, line at byte {offset}") from e
+        offset += len(line) + 1
+    return results
+
+
+def load_lines(
+    path: str | os.PathLike[str],
+    workers: int | None = None,
+    ordered: bool = True,
+    chunk_size: int = 4 * 1024 * 1024,
+) -> Iterator[JSON]:
+    chunks = ranges(path, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) == 1:
+        for start, end in chunks:
+            yield from parse_range(path, start, end)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending: deque[Future[list[JSON]]] = deque()
+        todo = iter(chunks)
+
+        def submit() -> None:
+            for start, end in todo:
+                pending.append(executor.submit(parse_range, path, start, end))
+                if len(pending) >= 2 * workers:
+                    return
+
+        submit()
+        while pending:
+            if ordered:
+                batch = pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                pending.remove(future)
+                batch = future.result()
+            submit()
+            yield from batch
@@ -0,0 +1,157 @@
+import mmap
+import os
+import re
+
+from .pyson3 import (
+    JSON,
+    KEY_CACHE_SIZE,
+    Array,
+    Object,
+    ParseFloat,
+    Value,
+    decode_number,
+    unescape,
+)
+from .relex import TOKEN
+
+BYTES_TOKEN = re.compile(TOKEN.pattern.encode(), re.VERBOSE)
+BYTES_WHITESPACE = re.compile(rb"[ \b\t\r\n\f]*")
+
+Buffer = bytes | bytearray | mmap.mmap
+Lexeme = tuple[str | None, int, int]
+
+
+class MappedParser:
+    def __init__(
+        self, key_cache_size: int = KEY_CACHE_SIZE, parse_float: ParseFloat = float
+    ) -> None:
+        self.key_cache_size = key_cache_size
+        self.parse_float = parse_float
+        self.keys: dict[bytes, str] = {}
+
+    def _error(self, msg: str) -> str:
+        context = bytes(self.buffer[max(self.i - 10, 0) : self.i + 10])
+        return f"{msg}, {self.i=}, {context=}"
+
+    def next(self) -> Lexeme:
+        m = BYTES_TOKEN.match(self.buffer, self.i)
+        assert m  # mypy fix
+        kind = m.lastgroup
+        if kind is None:
+            self.i = m.end()
+            if self.i >= self.length:
+                raise ValueError(self._error("Unexpected end of input"))
+            raise ValueError(self._error("Unexpected byte"))
+
+        start, self.i = m.span(kind)
+        return kind, start, self.i
+
+    def string(self, start: int, end: int, escaped: bool = False) -> str:
+        string = self.buffer[start + 1 : end - 1].decode("utf8")
+        return unescape(string) if escaped else string
+
+    def key(self, start: int, end: int, escaped: bool) -> str:
+        raw = self.buffer[start + 1 : end - 1]
+        key = self.keys.get(raw)
+        if key is None:
+            key = raw.decode("utf8")
+            if escaped:
+                key = unescape(key)
+            if len(self.keys) < self.key_cache_size:
+                self.keys[raw] = key
+        return key
+
+    def parse_value(self, kind: str | None, start: int, end: int) -> Value:
+        match kind:
+            case "STRING":
+                return self.string(start, end)
+            case "ESCAPED":
+                return self.string(start, end, True)
+            case "NUMBER" | "FLOAT":
+                string = self.buffer[start:end].decode("ascii")
+                return decode_number(string, kind == "FLOAT", self.parse_float)
+            case "L_CURLY":
+                return self.parse_object()
+            case "L_BRACKET":
+                return self.parse_array()
+            case "BOOLEAN":
+                return end - start == 4
+            case "NULL":
+                return None
+            case _:
+                raise ValueError(self._error("Unexpected token"))
+
+    def parse_object(self) -> Object:
+        result: Object = {}
+        kind, start, end = self.next()
+        if kind == "R_CURLY":
+            return result
+
+        while True:
+            if kind != "STRING" and kind != "ESCAPED":
+                raise ValueError(self._error("Expected string key"))
+            key = self.key(start, end, kind == "ESCAPED")
+            if key in result:
+                raise ValueError(self._error("Duplicate key found"))
+            if self.next()[0] != "COLON":
+                raise ValueError(self._error("Expected colon"))
+
+            result[key] = self.parse_value(*self.next())
+
+            match self.next()[0]:
+                case "COMMA":
+                    kind, start, end = self.next()
+                case "R_CURLY":
+                    return result
+                case _:
+                    raise ValueError(self._error("Expected comma or closing curly"))
+
+    def parse_array(self) -> Array:
+        result: Array = []
+        kind, start, end = self.next()
+        if kind == "R_BRACKET":
+            return result
+
+        while True:
+            result.append(self.parse_value(kind, start, end))
+
+            match self.next()[0]:
+                case "COMMA":
+                    kind, start, end = self.next()
+                case "R_BRACKET":
+                    return result
+                case _:
+                    raise ValueError(self._error("Expected comma or closing bracket"))
+
+    def parse(self, buffer: Buffer) -> JSON:
+        self.buffer = buffer
+        self.length = len(buffer)
+        self.i = 0
+        self.keys = {}
+
+        match self.next()[0]:
+            case "L_CURLY":
+                result: JSON = self.parse_object()
+            case "L_BRACKET":
+                result = self.parse_array()
+            case _:
+                raise ValueError(self._error("Invalid input"))
+
+        m = BYTES_WHITESPACE.match(buffer, self.i)
+        assert m  # mypy fix
+        if m.end() != self.length:
+            self.i = m.end()
+            raise ValueError(self._error("Extra data"))
+        return result
+
+
+def loads(buffer: Buffer, parse_float: ParseFloat = float) -> JSON:
+    return MappedParser(parse_float=parse_float).parse(buffer)
+
+
+def load_path(path: str | os.PathLike[str]) -> JSON:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("Unexpected end of input")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return loads(buffer)
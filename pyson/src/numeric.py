@@ -0,0 +1,47 @@
+import re
+from array import array
+from typing import Any
+
+from .pyson3 import is_fractional
+
+MODES = ("array", "numpy")
+NUMBERS = re.compile(
+    r"""
+    [ \b\t\r\n\f]*
+    (
+        -?[0-9][0-9.eE+\-]*
+        (?:[ \b\t\r\n\f]*,[ \b\t\r\n\f]*-?[0-9][0-9.eE+\-]*)*
+    )
+    [ \b\t\r\n\f]*\]
+    """,
+    re.VERBOSE,
+)
+
+
+def check_mode(mode: str | None) -> None:
+    if mode is None:
+        return
+    if mode not in MODES:
+        raise ValueError(f"Unknown numeric_arrays mode {mode}")
+    if mode == "numpy":
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            raise ImportError("numeric_arrays='numpy' requires numpy") from None
+
+
+def pack(text: str, mode: str) -> Any:
+    parts = text.split(",")
+    try:
+        if is_fractional(text):
+            packed = array("d", map(float, parts))
+        else:
+            packed = array("q", map(int, parts))
+    except OverflowError:
+        return None
+
+    if mode == "numpy":
+        import numpy
+
+        return numpy.frombuffer(packed, dtype=packed.typecode)
+    return packed
@@ -0,0 +1,118 @@
+import os
+import re
+import sys
+from bisect import bisect_left
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from . import pyson3
+from .pyson3 import JSON, Array, ParseFloat
+
+STRUCTURE = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{},]')
+BLANK = re.compile(r"[ \b\t\r\n\f]*")
+
+
+def is_blank(json: str, start: int, end: int) -> bool:
+    m = BLANK.match(json, start, end)
+    assert m  # mypy fix
+    return m.end() == end
+
+
+def top_level_commas(json: str) -> tuple[int, int, list[int]] | None:
+    depth = 0
+    start = -1
+    commas: list[int] = []
+    for m in STRUCTURE.finditer(json):
+        i = m.start()
+        match json[i]:
+            case "[" | "{" as value:
+                if depth == 0:
+                    if value != "[":
+                        return None
+                    start = i
+                depth += 1
+            case "]" | "}":
+                depth -= 1
+                if depth == 0:
+                    if json[i] != "]":
+                        return None
+                    if commas and is_blank(json, commas[-1] + 1, i):
+                        return None
+                    return start, i, commas
+            case ",":
+                if depth == 1:
+                    if is_blank(json, commas[-1] + 1 if commas else start + 1, i):
+                        return None
+                    commas.append(i)
+    return None
+
+
+def partition(
+    start: int, end: int, commas: list[int], chunks: int
+) -> list[tuple[int, int]]:
+    step = (end - start) / chunks
+    cuts: list[int] = []
+    for k in range(1, chunks):
+        idx = bisect_left(commas, start + k * step)
+        if idx < len(commas) and (not cuts or commas[idx] > cuts[-1]):
+            cuts.append(commas[idx])
+
+    bounds = [start, *cuts, end]
+    return [(a + 1, b) for a, b in zip(bounds, bounds[1:])]
+
+
+def parse_chunk(
+    chunk: str, engine: str, parse_float: ParseFloat, value_cache_size: int = 0
+) -> Array:
+    result = pyson3.loads(
+        f"[{chunk}]",
+        engine=engine,
+        parse_float=parse_float,
+        value_cache_size=value_cache_size,
+    )
+    assert isinstance(result, list)  # mypy fix
+    return result
+
+
+def executor(workers: int) -> Executor:
+    if hasattr(sys, "_is_gil_enabled") and not sys._is_gil_enabled():
+        return ThreadPoolExecutor(workers)
+    return ProcessPoolExecutor(workers)
+
+
+def loads(
+    json: str,
+    workers: int | None = None,
+    engine: str = "tokens",
+    min_size: int = 1024 * 1024,
+    parse_float: ParseFloat = float,
+    value_cache_size: int = 0,
+) -> JSON:
+    workers = workers or os.cpu_count() or 1
+    structure = top_level_commas(json) if len(json) >= min_size else None
+    if workers == 1 or structure is None or not structure[2]:
+        return pyson3.loads(
+            json,
+            engine=engine,
+            parse_float=parse_float,
+            value_cache_size=value_cache_size,
+        )
+
+    start, end, commas = structure
+    if json[end + 1 :].strip(" \b\t\r\n\f"):
+        return pyson3.loads(
+            json,
+            engine=engine,
+            parse_float=parse_float,
+            value_cache_size=value_cache_size,
+        )
+
+    chunks = [json[a:b] for a, b in partition(start, end, commas, workers * 4)]
+    result: Array = []
+    with executor(workers) as pool:
+        engines = [engine] * len(chunks)
+        parse_floats = [parse_float] * len(chunks)
+        cache_sizes = [value_cache_size] * len(chunks)
+        parts = pool.map(parse_chunk, chunks, engines, parse_floats, cache_sizes)
+        for part in parts:
+            result.extend(part)
+    return result
@@ -1,7 +1,8 @@
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 from enum import Enum, auto
 from time import time
-from typing import Any, Callable, Literal, TypeVar, Union
+from typing import Literal, Union
 
 Value = Union[str, int, float, "Array", "Object", None, Literal[True], Literal[False]]
 Object = dict[str, Value]
@@ -20,287 +21,333 @@ class TokenType(Enum):
     NUMBER = auto()
     BOOLEAN = auto()
     NULL = auto()
-    EMPTY = auto()
 
 
-@dataclass(frozen=True)
-class Token:
-    type: TokenType
-    value: str | None = None
-
-
-WHITESPACE = set(" \b\t\r\n\f")
-HEXDIGITS = set("0123456789abcdefABCDEF")
-DIGITS = set("0123456789")
-NUMERIC = set("0123456789.eE+-")
-
-
-T = TypeVar("T")
-Func = Callable[..., Any]
-
-
-class SimpleHashMap:
-    def __init__(self, hash_func: Callable[[T], int], items: list[T]) -> None:
-        pass
-
-
-class Matcher:
-    def __init__(self, cases: dict[str, Func]) -> None:
-        self.cases = cases
-
-    def __getitem__(self, key: str) -> Func | None:
-        return self.cases.get(key, None)
-
-    def get(self, value: str) -> Func | None:
-        return self.cases.get(value, None)
-
-
-def l_curly(i: int, *_: Any) -> tuple[Token, int]:
-    return Token(TokenType.L_CURLY), i + 1
-
-
-def r_curly(i: int, *_: Any) -> tuple[Token, int]:
-    return Token(TokenType.R_CURLY), i + 1
-
-
-def l_bracket(i: int, *_: Any) -> tuple[Token, int]:
-    return Token(TokenType.L_BRACKET), i + 1
-
-
-def r_bracket(i: int, *_: Any) -> tuple[Token, int]:
-    return Token(TokenType.R_BRACKET), i + 1
-
-
-def colon(i: int, *_: Any) -> tuple[Token, int]:
-    return Token(TokenType.COLON), i + 1
+L_CURLY = TokenType.L_CURLY.value
+R_CURLY = TokenType.R_CURLY.value
+L_BRACKET = TokenType.L_BRACKET.value
+R_BRACKET = TokenType.R_BRACKET.value
+COLON = TokenType.COLON.value
+COMMA = TokenType.COMMA.value
+STRING = TokenType.STRING.value
+NUMBER = TokenType.NUMBER.value
+BOOLEAN = TokenType.BOOLEAN.value
+NULL = TokenType.NULL.value
+
+SMALL_INTS = {str(i): i for i in range(-1024, 1025)}
+ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+WHITESPACE_RUN = re.compile(r"[ \b\t\r\n\f]+")
+NUMBER_RUN = re.compile(r"[0-9.eE+\-]+")
+ESCAPE = re.compile(r"\\(u[0-9a-fA-F]{4}|.?)", re.DOTALL)
+
+
+def unescape(string: str) -> str:
+    if "\\" not in string:
+        return string
+
+    parts = ESCAPE.split(string)
+    if "\\u" not in string:
+        try:
+            parts[1::2] = [ESCAPES[value] for value in parts[1::2]]
+        except KeyError:
+            raise ValueError("Invalid string escaping") from None
+        return "".join(parts)
+
+    i = 1
+    while i < len(parts):
+        value = parts[i]
+        if len(value) == 5:
+            code = int(value[1:], 16)
+            low = parts[i + 2] if i + 2 < len(parts) and not parts[i + 1] else ""
+            if 0xD800 <= code < 0xDC00 and len(low) == 5:
+                low_code = int(low[1:], 16)
+                if 0xDC00 <= low_code < 0xE000:
+                    code = 0x10000 + ((code - 0xD800) << 10) + (low_code - 0xDC00)
+                    parts[i] = ""
+                    i += 2
+            parts[i] = chr(code)
+        elif value in ESCAPES:
+            parts[i] = ESCAPES[value]
+        elif value == "u":
+            raise ValueError("Invalid unicode sequence")
+        else:
+            raise ValueError("Invalid string escaping")
+        i += 2
 
+    return "".join(parts)
 
-def comma(i: int, *_: Any) -> tuple[Token, int]:
-    return Token(TokenType.COMMA), i + 1
 
+@dataclass
+class TokenBuffer:
+    types: bytearray = field(default_factory=bytearray)
+    values: list[Value] = field(default_factory=list)
+    length: int = 0
 
-def true(i: int, json: str, _: Matcher) -> tuple[Token, int]:
-    _true = json[i : i + 4]
-    if _true != "true":
-        raise ValueError("Invalid true value")
-    return Token(TokenType.BOOLEAN, "true"), i + 4
+    def __len__(self) -> int:
+        return self.length
 
+    def grow(self, capacity: int) -> None:
+        extra = capacity - len(self.types)
+        self.types.extend(bytes(extra))
+        self.values.extend([None] * extra)
 
-def false(i: int, json: str, _: Matcher) -> tuple[Token, int]:
-    _false = json[i : i + 5]
-    if _false != "false":
-        raise ValueError("Invalid false value")
-    return Token(TokenType.BOOLEAN, "false"), i + 5
 
+class Lexer:
+    def __init__(self, json: str) -> None:
+        self.json = json
+        self.i = 0
+        self.n = 0
+        self.buffer = TokenBuffer()
+        self.buffer.grow(capacity(json))
+        self.types = self.buffer.types
+        self.values = self.buffer.values
+
+    def skip(self) -> None:
+        m = WHITESPACE_RUN.match(self.json, self.i)
+        assert m  # mypy fix
+        self.i = m.end()
+
+    def unknown(self) -> None:
+        self.i += 1
 
-def null(i: int, json: str, _: Matcher) -> tuple[Token, int]:
-    _null = json[i : i + 4]
-    if _null != "null":
-        raise ValueError("Invalid null value")
-    return Token(TokenType.NULL, "null"), i + 4
+    def l_curly(self) -> None:
+        self.types[self.n] = L_CURLY
+        self.n += 1
+        self.i += 1
 
+    def r_curly(self) -> None:
+        self.types[self.n] = R_CURLY
+        self.n += 1
+        self.i += 1
 
-def number(i: int, json: str, _: Matcher) -> tuple[Token, int]:
-    start = i
-    while json[i] in NUMERIC:
-        i += 1
+    def l_bracket(self) -> None:
+        self.types[self.n] = L_BRACKET
+        self.n += 1
+        self.i += 1
 
-    return Token(TokenType.NUMBER, json[start:i]), i
+    def r_bracket(self) -> None:
+        self.types[self.n] = R_BRACKET
+        self.n += 1
+        self.i += 1
 
+    def colon(self) -> None:
+        self.types[self.n] = COLON
+        self.n += 1
+        self.i += 1
 
-def string_replacement(i: int, idx: int, json: str) -> tuple[Token, int]:
-    idx += 1
-    string = (
-        json[i:idx]
-        .replace("\\\\", "\\")
-        .replace('\\"', '"')
-        .replace("\\/", "/")
-        .replace("\\b", "\b")
-        .replace("\\f", "\f")
-        .replace("\\n", "\n")
-        .replace("\\r", "\r")
-        .replace("\\t", "\t")
-        .replace("\\u", "u")
-    )
-    return Token(TokenType.STRING, string), idx
+    def comma(self) -> None:
+        self.types[self.n] = COMMA
+        self.n += 1
+        self.i += 1
 
+    def literal(self, literal: str, kind: int, value: Value) -> None:
+        if not self.json.startswith(literal, self.i):
+            raise ValueError(f"Invalid {literal} value")
+        self.types[self.n] = kind
+        self.values[self.n] = value
+        self.n += 1
+        self.i += len(literal)
 
-def string_escaping(i: int, idx: int, json: str) -> tuple[Token, int]:
-    n = json[idx + 1]
-    match n:
-        case '"' | "\\" | "/" | "b" | "f" | "n" | "r" | "t":
-            idx += 2
-        case "u":
-            unicodes = json[idx + 2 : idx + 6]
-            hx1, hx2, hx3, hx4 = unicodes.split("")
-            if not (
-                hx1 in HEXDIGITS
-                and hx2 in HEXDIGITS
-                and hx3 in HEXDIGITS
-                and hx4 in HEXDIGITS
-            ):
-                raise ValueError("Invalid unicode sequence")
-            idx += 6
-        case _:
-            raise ValueError("Invalid string escaping")
-    return Token(TokenType.EMPTY), idx
-
-
-def string(i: int, json: str, matcher: Matcher) -> tuple[Token, int]:
-    idx = i + 1
-    while json:
-        func = matcher[json[idx]]
-        if func:
-            token, idx = func(
-                i,
-                idx,
-                json,
-            )
-            if token.type != TokenType.EMPTY:
-                return token, idx
-        else:
-            idx += 1
-    return Token(TokenType.EMPTY), -1
-
-
-lex_matchers: dict[str, Func] = {
-    "{": l_curly,
-    "}": r_curly,
-    "[": l_bracket,
-    "]": r_bracket,
-    ":": colon,
-    ",": comma,
-    "t": true,
-    "f": false,
-    "n": null,
-    '"': string,
-    "0": number,
-    "1": number,
-    "2": number,
-    "3": number,
-    "4": number,
-    "5": number,
-    "6": number,
-    "7": number,
-    "8": number,
-    "9": number,
-    "-": number,
-}
+    def true(self) -> None:
+        self.literal("true", BOOLEAN, True)
 
-lex_string_matchers: dict[str, Func] = {'"': string_replacement, "\\": string_escaping}
+    def false(self) -> None:
+        self.literal("false", BOOLEAN, False)
 
+    def null(self) -> None:
+        self.literal("null", NULL, None)
 
-def lex(json: str) -> list[Token]:
-    tokens: list[Token] = []
-    total_len = len(json)
+    def number(self) -> None:
+        m = NUMBER_RUN.match(self.json, self.i)
+        assert m  # mypy fix
+        string = m.group()
+        self.i = m.end()
 
-    matcher = Matcher(lex_matchers)
-    string_matcher = Matcher(lex_string_matchers)
-    i = 0
-    while i < total_len:
-        func = matcher[json[i]]
-        if func:
-            token, i = func(i, json, string_matcher)
-            tokens.append(token)
+        value: int | float | None
+        if "." in string or "e" in string or "E" in string:
+            value = float(string)
         else:
-            i += 1
-
-    return tokens
+            value = SMALL_INTS.get(string)
+            if value is None:
+                value = int(string)
+        self.types[self.n] = NUMBER
+        self.values[self.n] = value
+        self.n += 1
+
+    def string(self) -> None:
+        json = self.json
+        start = self.i + 1
+        idx = start
+        escaped = False
+        end = json.find('"', idx)
+        while True:
+            if end == -1:
+                raise ValueError("Unterminated string")
+            backslash = json.find("\\", idx, end)
+            if backslash == -1:
+                break
+            escaped = True
+            idx = backslash + 2
+            if idx > end:
+                end = json.find('"', idx)
+
+        string = json[start:end]
+        self.types[self.n] = STRING
+        self.values[self.n] = unescape(string) if escaped else string
+        self.n += 1
+        self.i = end + 1
+
+    def lex(self) -> TokenBuffer:
+        json = self.json
+        total_len = len(json)
+        classes = CLASSES
+        handlers = [getattr(self, name) for name in HANDLERS]
+        other = handlers[0]
+
+        while self.i < total_len:
+            if self.n == len(self.types):
+                self.buffer.grow(2 * self.n)
+            code = ord(json[self.i])
+            if code < 128:
+                handlers[classes[code]]()
+            else:
+                other()
+
+        self.buffer.length = self.n
+        return self.buffer
+
+
+HANDLERS = [
+    "unknown",
+    "skip",
+    "l_curly",
+    "r_curly",
+    "l_bracket",
+    "r_bracket",
+    "colon",
+    "comma",
+    "string",
+    "number",
+    "true",
+    "false",
+    "null",
+]
+CLASSES = bytearray(128)
+for chars, handler in [
+    (" \b\t\r\n\f", "skip"),
+    ("{", "l_curly"),
+    ("}", "r_curly"),
+    ("[", "l_bracket"),
+    ("]", "r_bracket"),
+    (":", "colon"),
+    (",", "comma"),
+    ('"', "string"),
+    ("-0123456789", "number"),
+    ("t", "true"),
+    ("f", "false"),
+    ("n", "null"),
+]:
+    for char in chars:
+        CLASSES[ord(char)] = HANDLERS.index(handler)
+
+
+def capacity(json: str) -> int:
+    return 2 * (json.count(",") + json.count(":")) + 16
+
+
+def lex(json: str) -> TokenBuffer:
+    return Lexer(json).lex()
 
 
 class Parser:
     def _error(self, msg: str) -> str:
-        prior_tokens = self.tokens[self.i - 2 : self.i]
-        return f"{msg}, {prior_tokens=}, {self.i=}, value={self.tokens[self.i]}"
+        prior_tokens = [TokenType(t) for t in self.types[max(self.i - 2, 0) : self.i]]
+        value = TokenType(self.types[self.i]) if self.i < self.length else None
+        return f"{msg}, {prior_tokens=}, {self.i=}, {value=}"
 
     def parse_value(self) -> Value:
-        value: Value = None
-        v = self.tokens[self.i]
-        match v.type:
-            case TokenType.STRING:
-                self.i += 1
-                value = v.value
-            case TokenType.NUMBER:
-                self.i += 1
-                assert v.value  # mypy fix
-                as_float = float(v.value)
-                value = as_float if "." in v.value else int(as_float)
-            case TokenType.L_CURLY:
-                value = self.parse_object()
-            case TokenType.L_BRACKET:
-                value = self.parse_array()
-            case TokenType.BOOLEAN:
-                self.i += 1
-                value = True if v.value == "true" else False
-            case TokenType.NULL:
-                self.i += 1
-            case _:
-                raise ValueError(self._error("Unknown tokentype"))
+        i = self.i
+        kind = self.types[i]
+        self.i = i + 1
+        value: Value
+        if kind == L_CURLY:
+            value = self.parse_object()
+        elif kind == L_BRACKET:
+            value = self.parse_array()
+        elif kind >= STRING:
+            value = self.values[i]
+        else:
+            self.i = i
+            raise ValueError(self._error("Unknown tokentype"))
 
-        if self.tokens[self.i].type == TokenType.COMMA:
+        if self.i < self.length and self.types[self.i] == COMMA:
             self.i += 1
 
         return value
 
     def parse_object(self) -> Object:
-        self.i += 1
         result: Object = {}
-        known_keys: set[str] = set()
+        types = self.types
 
         while self.i < self.length:
-            _type = self.tokens[self.i].type
-            match _type:
-                case TokenType.R_CURLY:
-                    self.i += 1
-                    break
-                case TokenType.STRING:
-                    key = self.tokens[self.i].value
-                    assert key  # mypy fix
-                    if key in known_keys:
-                        raise ValueError(self._error("Duplicate key found"))
-                    known_keys.add(key)
-                    self.i += 1
-
-                    if self.tokens[self.i].type != TokenType.COLON:
-                        raise ValueError(self._error("Expected colon"))
-                    self.i += 1
-
-                    value = self.parse_value()
-                    result[key] = value
-                case _:
-                    raise ValueError(self._error("Invalid object content"))
+            kind = types[self.i]
+            if kind == R_CURLY:
+                self.i += 1
+                break
+            if kind != STRING:
+                raise ValueError(self._error("Invalid object content"))
+
+            key = self.values[self.i]
+            assert isinstance(key, str)  # mypy fix
+            if key in result:
+                raise ValueError(self._error("Duplicate key found"))
+            self.i += 1
+
+            if self.i >= self.length or types[self.i] != COLON:
+                raise ValueError(self._error("Expected colon"))
+            self.i += 1
+
+            result[key] = self.parse_value()
 
         return result
 
     def parse_array(self) -> Array:
-        self.i += 1
         result: Array = []
+        types = self.types
+
         while self.i < self.length:
-            _type = self.tokens[self.i].type
-            match _type:
-                case TokenType.R_BRACKET:
-                    self.i += 1
-                    break
-                case _:
-                    result.append(self.parse_value())
+            if types[self.i] == R_BRACKET:
+                self.i += 1
+                break
+            result.append(self.parse_value())
         return result
 
-    def parse(self, tokens: list[Token]) -> JSON:
-        self.tokens = tokens
-        self.length = len(tokens)
+    def parse(self, tokens: TokenBuffer) -> JSON:
+        self.types = tokens.types
+        self.values = tokens.values
+        self.length = tokens.length
+        self.i = 0
 
-        if len(tokens) < 2:
+        if self.length < 2:
             raise ValueError(self._error("Too short to be valid"))
 
+        kind = self.types[0]
+        self.i = 1
+        if kind == L_CURLY:
+            return self.parse_object()
+        if kind == L_BRACKET:
+            return self.parse_array()
         self.i = 0
-        _type = self.tokens[self.i].type
-        match _type:
-            case TokenType.L_CURLY:
-                return self.parse_object()
-            case TokenType.L_BRACKET:
-                return self.parse_array()
-            case _:
-                raise ValueError(self._error("Invalid input"))
+        raise ValueError(self._error("Invalid input"))
 
 
 def loads(json: str) -> JSON:
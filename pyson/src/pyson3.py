@@ -1,12 +1,14 @@
+import re
 from dataclasses import dataclass
 from enum import Enum, auto
 from time import time
-from typing import Literal, Union
+from typing import IO, Any, Callable, Literal, Union
 
 Value = Union[str, int, float, "Array", "Object", None, Literal[True], Literal[False]]
 Object = dict[str, Value]
 Array = list[Value]
 JSON = Array | Object
+ParseFloat = Callable[[str], Any]
 
 
 class TokenType(Enum):
@@ -27,12 +29,25 @@ class Token:
     type: TokenType
     start: int
     end: int
+    escaped: bool = False
+    is_float: bool = False
 
 
 WHITESPACE = set(" \b\t\r\n\f")
 HEXDIGITS = set("0123456789abcdefABCDEF")
 DIGITS = set("0123456789")
 NUMERIC = set("0123456789.eE+-")
+SMALL_INTS = {str(i): i for i in range(-1024, 1025)}
+ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
 
 
 def lex(json: str) -> list[Token]:
@@ -81,22 +96,24 @@ def lex(json: str) -> list[Token]:
                 i += 4
             case '"':
                 idx = i + 1
+                escaped = False
                 while json:
                     v = json[idx]
                     match v:
                         case '"':
                             idx += 1
-                            tokens.append(Token(TokenType.STRING, i, idx))
+                            tokens.append(Token(TokenType.STRING, i, idx, escaped))
                             i = idx
                             break
                         case "\\":
+                            escaped = True
                             n = json[idx + 1]
                             match n:
                                 case '"' | "\\" | "/" | "b" | "f" | "n" | "r" | "t":
                                     idx += 2
                                 case "u":
                                     unicodes = json[idx + 2 : idx + 6]
-                                    hx1, hx2, hx3, hx4 = unicodes.split("")
+                                    hx1, hx2, hx3, hx4 = unicodes
                                     if not (
                                         hx1 in HEXDIGITS
                                         and hx2 in HEXDIGITS
@@ -114,31 +131,117 @@ def lex(json: str) -> list[Token]:
                 while json[i] in NUMERIC:
                     i += 1
 
-                tokens.append(Token(TokenType.NUMBER, start, i))
+                is_float = is_fractional(json[start:i])
+                tokens.append(Token(TokenType.NUMBER, start, i, False, is_float))
             case _:
                 i += 1
 
     return tokens
 
 
+def is_fractional(string: str) -> bool:
+    return "." in string or "e" in string or "E" in string
+
+
+def decode_number(
+    string: str, is_float: bool, parse_float: ParseFloat = float
+) -> int | float:
+    if is_float:
+        return parse_float(string)
+    small = SMALL_INTS.get(string)
+    return int(string) if small is None else small
+
+
+ESCAPE = re.compile(r"\\(u[0-9a-fA-F]{4}|.?)", re.DOTALL)
+
+
+def unescape(string: str) -> str:
+    if "\\" not in string:
+        return string
+
+    parts = ESCAPE.split(string)
+    if "\\u" not in string:
+        try:
+            parts[1::2] = [ESCAPES[value] for value in parts[1::2]]
+        except KeyError:
+            raise ValueError("Invalid string escaping") from None
+        return "".join(parts)
+
+    i = 1
+    while i < len(parts):
+        value = parts[i]
+        if len(value) == 5:
+            code = int(value[1:], 16)
+            low = parts[i + 2] if i + 2 < len(parts) and not parts[i + 1] else ""
+            if 0xD800 <= code < 0xDC00 and len(low) == 5:
+                low_code = int(low[1:], 16)
+                if 0xDC00 <= low_code < 0xE000:
+                    code = 0x10000 + ((code - 0xD800) << 10) + (low_code - 0xDC00)
+                    parts[i] = ""
+                    i += 2
+            parts[i] = chr(code)
+        elif value in ESCAPES:
+            parts[i] = ESCAPES[value]
+        elif value == "u":
+            raise ValueError("Invalid unicode sequence")
+        else:
+            raise ValueError("Invalid string escaping")
+        i += 2
+
+    return "".join(parts)
+
+
+KEY_CACHE_SIZE = 4096
+ENGINE_NAMES = ("tokens", "direct", "regex", "stream", "iterative")
+
+
 class Parser:
+    def __init__(
+        self,
+        lexer: Callable[[str], list[Token]] = lex,
+        key_cache_size: int = KEY_CACHE_SIZE,
+        parse_float: ParseFloat = float,
+        numeric_arrays: str | None = None,
+        value_cache_size: int = 0,
+    ) -> None:
+        if numeric_arrays is not None:
+            from .numeric import check_mode
+
+            check_mode(numeric_arrays)
+        self.lexer = lexer
+        self.key_cache_size = key_cache_size
+        self.parse_float = parse_float
+        self.numeric_arrays = numeric_arrays
+        self.value_cache_size = value_cache_size
+
     def _error(self, msg: str) -> str:
         prior_tokens = self.tokens[self.i - 2 : self.i]
         return f"{msg}, {prior_tokens=}, {self.i=}, value={self.tokens[self.i]}"
 
     def normalized_string(self, t: Token) -> str:
-        return (
-            self.get_string(t)
-            .replace("\\\\", "\\")
-            .replace('\\"', '"')
-            .replace("\\/", "/")
-            .replace("\\b", "\b")
-            .replace("\\f", "\f")
-            .replace("\\n", "\n")
-            .replace("\\r", "\r")
-            .replace("\\t", "\t")
-            .replace("\\u", "u")
-        )
+        string = self.json[t.start + 1 : t.end - 1]
+        return unescape(string) if t.escaped else string
+
+    def key(self, t: Token) -> str:
+        raw = self.json[t.start + 1 : t.end - 1]
+        key = self.keys.get(raw)
+        if key is None:
+            key = unescape(raw) if t.escaped else raw
+            if len(self.keys) < self.key_cache_size:
+                self.keys[raw] = key
+        return key
+
+    def shared_value(self, t: Token) -> Value:
+        raw = self.json[t.start : t.end]
+        value = self.values.get(raw)
+        if value is None:
+            if t.type == TokenType.STRING:
+                value = unescape(raw[1:-1]) if t.escaped else raw[1:-1]
+            else:
+                value = decode_number(raw, t.is_float, self.parse_float)
+            if len(self.values) < self.value_cache_size:
+                self.values[raw] = value
+        return value
 
     def get_string(self, t: Token) -> str:
         return self.json[t.start : t.end]
@@ -147,14 +250,15 @@ class Parser:
         value: Value = None
         t = self.tokens[self.i]
         match t.type:
+            case TokenType.STRING | TokenType.NUMBER if self.value_cache_size:
+                self.i += 1
+                value = self.shared_value(t)
             case TokenType.STRING:
                 self.i += 1
                 value = self.normalized_string(t)
             case TokenType.NUMBER:
                 self.i += 1
-                string = self.get_string(t)
-                as_float = float(string)
-                value = as_float if "." in string else int(as_float)
+                value = decode_number(self.get_string(t), t.is_float, self.parse_float)
             case TokenType.L_CURLY:
                 self.i += 1
                 value = self.parse_object()
@@ -177,7 +281,6 @@ class Parser:
 
     def parse_object(self) -> Object:
         result: Object = {}
-        known_keys: set[str] = set()
 
         while self.i < self.length:
             _type = self.tokens[self.i].type
@@ -186,11 +289,9 @@ class Parser:
                     self.i += 1
                     break
                 case TokenType.STRING:
-                    key = self.normalized_string(self.tokens[self.i])
-                    assert key  # mypy fix
-                    if key in known_keys:
+                    key = self.key(self.tokens[self.i])
+                    if key in result:
                         raise ValueError(self._error("Duplicate key found"))
-                    known_keys.add(key)
                     self.i += 1
 
                     if self.tokens[self.i].type != TokenType.COLON:
@@ -204,7 +305,32 @@ class Parser:
 
         return result
 
+    def parse_numeric_array(self) -> Any:
+        from .numeric import pack
+
+        assert self.numeric_arrays  # mypy fix
+        tokens = self.tokens
+        j = self.i
+        while j + 1 < self.length and tokens[j].type == TokenType.NUMBER:
+            match tokens[j + 1].type:
+                case TokenType.R_BRACKET:
+                    text = self.json[tokens[self.i].start : tokens[j].end]
+                    packed = pack(text, self.numeric_arrays)
+                    if packed is not None:
+                        self.i = j + 2
+                    return packed
+                case TokenType.COMMA:
+                    j += 2
+                case _:
+                    return None
+        return None
+
     def parse_array(self) -> Array:
+        if self.numeric_arrays is not None:
+            packed = self.parse_numeric_array()
+            if packed is not None:
+                return packed
+
         result: Array = []
         while self.i < self.length:
             _type = self.tokens[self.i].type
@@ -216,10 +342,16 @@ class Parser:
                     result.append(self.parse_value())
         return result
 
-    def parse(self, json: str) -> JSON:
-        self.tokens = lex(json)
+    def reset(self, json: str) -> None:
+        self.tokens = self.lexer(json)
         self.length = len(self.tokens)
         self.json = json
+        self.keys: dict[str, str] = {}
+        self.values: dict[str, Value] = {}
+        self.i = 0
+
+    def parse(self, json: str) -> JSON:
+        self.reset(json)
 
         if len(self.tokens) < 2:
             raise ValueError(self._error("Too short to be valid"))
@@ -235,8 +367,89 @@ class Parser:
                 raise ValueError(self._error("Invalid input"))
 
 
-def loads(json: str) -> JSON:
-    return Parser().parse(json)
+def loads(
+    json: str,
+    engine: str = "tokens",
+    select: list[str] | None = None,
+    parallel: bool = False,
+    workers: int | None = None,
+    parse_float: ParseFloat = float,
+    numeric_arrays: str | None = None,
+    value_cache_size: int = 0,
+    max_depth: int | None = None,
+) -> JSON | dict[str, list[Value]]:
+    if engine not in ENGINE_NAMES:
+        raise ValueError(f"Unknown engine {engine}")
+    if max_depth is not None and (engine != "iterative" or select is not None):
+        raise ValueError("max_depth is only supported by the iterative engine")
+
+    if select is not None:
+        from .selector import Selector
+
+        if value_cache_size or numeric_arrays is not None:
+            raise ValueError("select does not support numeric_arrays or value caching")
+        return Selector(select, parse_float).select(json)
+
+    if parallel and numeric_arrays is None and max_depth is None:
+        from .parallel import loads as parallel_loads
+
+        return parallel_loads(
+            json,
+            workers,
+            engine,
+            parse_float=parse_float,
+            value_cache_size=value_cache_size,
+        )
+
+    match engine:
+        case "tokens":
+            return Parser(
+                parse_float=parse_float,
+                numeric_arrays=numeric_arrays,
+                value_cache_size=value_cache_size,
+            ).parse(json)
+        case "direct":
+            from .direct import loads as direct_loads
+
+            return direct_loads(json, parse_float, numeric_arrays, value_cache_size)
+        case "regex":
+            from .relex import lex as regex_lex
+
+            return Parser(
+                regex_lex,
+                parse_float=parse_float,
+                numeric_arrays=numeric_arrays,
+                value_cache_size=value_cache_size,
+            ).parse(json)
+        case "stream":
+            from .stream import loads as stream_loads
+
+            return stream_loads(json, parse_float, numeric_arrays, value_cache_size)
+        case "iterative":
+            from .iterative import MAX_DEPTH
+            from .iterative import loads as iterative_loads
+
+            return iterative_loads(
+                json,
+                max_depth=MAX_DEPTH if max_depth is None else max_depth,
+                parse_float=parse_float,
+                numeric_arrays=numeric_arrays,
+                value_cache_size=value_cache_size,
+            )
+        case _:
+            raise ValueError(f"Unknown engine {engine}")
+
+
+def dumps(value: Any) -> str:
+    from .encoder import dumps as encoder_dumps
+
+    return encoder_dumps(value)
+
+
+def dump(value: Any, fp: IO[str], chunk_size: int = 64 * 1024) -> None:
+    from .encoder import dump as encoder_dump
+
+    encoder_dump(value, fp, chunk_size)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+import re
+
+from .pyson3 import Token, TokenType
+
+TOKEN = re.compile(
+    r"""
+    [ \b\t\r\n\f]*
+    (?:
+        (?P<L_CURLY>\{)
+      | (?P<R_CURLY>\})
+      | (?P<L_BRACKET>\[)
+      | (?P<R_BRACKET>\])
+      | (?P<COLON>:)
+      | (?P<COMMA>,)
+      | (?P<STRING>"[^"\\]*")
+      | (?P<ESCAPED>"[^"\\]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\]*)+")
+      | (?P<NUMBER>-?[0-9]+(?![0-9.eE+\-]))
+      | (?P<FLOAT>[0-9.eE+\-]+)
+      | (?P<BOOLEAN>true|false)
+      | (?P<NULL>null)
+    )?
+    """,
+    re.VERBOSE,
+)
+
+TOKEN_TYPES: dict[str | None, TokenType] = {t.name: t for t in TokenType}
+TOKEN_TYPES["ESCAPED"] = TokenType.STRING
+TOKEN_TYPES["FLOAT"] = TokenType.NUMBER
+
+
+def unknown(json: str, i: int) -> int:
+    match json[i]:
+        case "t":
+            raise ValueError("Invalid true value")
+        case "f":
+            raise ValueError("Invalid false value")
+        case "n":
+            raise ValueError("Invalid null value")
+        case '"':
+            raise ValueError("Invalid string")
+        case _:
+            return i + 1
+
+
+def lex(json: str) -> list[Token]:
+    tokens: list[Token] = []
+    append = tokens.append
+    match_token = TOKEN.match
+    types = TOKEN_TYPES
+    total_len = len(json)
+
+    i = 0
+    while i < total_len:
+        m = match_token(json, i)
+        assert m  # mypy fix
+        kind = m.lastgroup
+        if kind is None:
+            end = m.end()
+            i = end if end > i else unknown(json, i)
+            continue
+
+        start, i = m.span(kind)
+        append(Token(types[kind], start, i, kind == "ESCAPED", kind == "FLOAT"))
+
+    return tokens
@@ -0,0 +1,228 @@
+import dataclasses
+import types
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from .pyson3 import Parser, TokenType
+
+T = TypeVar("T")
+Decoder = Callable[["SchemaParser"], Any]
+
+MISSING = object()
+SCHEMAS: dict[type, "Schema[Any]"] = {}
+
+
+def is_record(tp: Any) -> bool:
+    return isinstance(tp, type) and (
+        dataclasses.is_dataclass(tp) or "__slots__" in vars(tp)
+    )
+
+
+def slot_names(cls: type) -> list[str]:
+    names: list[str] = []
+    for klass in reversed(cls.__mro__):
+        slots = vars(klass).get("__slots__", ())
+        names.extend([slots] if isinstance(slots, str) else slots)
+    return [name for name in names if name not in ("__dict__", "__weakref__")]
+
+
+def constant(value: Any) -> Callable[[], Any]:
+    return lambda: value
+
+
+def decoder_for(tp: Any) -> Decoder | None:
+    if is_record(tp):
+        return partial(SchemaParser.parse_record, schema=compile_schema(tp))
+
+    origin = get_origin(tp)
+    args = get_args(tp)
+    if origin is list and args:
+        item = decoder_for(args[0])
+        if item is not None:
+            return partial(SchemaParser.parse_list, item=item)
+    if (origin is Union or origin is types.UnionType) and type(None) in args:
+        rest = [arg for arg in args if arg is not type(None)]
+        inner = decoder_for(rest[0]) if len(rest) == 1 else None
+        if inner is not None:
+            return partial(SchemaParser.parse_optional, inner=inner)
+    return None
+
+
+class Schema(Generic[T]):
+    def __init__(self, cls: type[T]) -> None:
+        self.cls: Any = cls
+        self.slotted = not dataclasses.is_dataclass(cls)
+        self.defaults: list[Callable[[], Any] | None] = []
+        self.keywords: list[str] = []
+
+        if self.slotted:
+            self.names = slot_names(cls)
+            self.defaults = [None] * len(self.names)
+        else:
+            init = [f for f in dataclasses.fields(self.cls) if f.init]
+            init.sort(key=lambda f: f.kw_only is True)
+            self.names = [f.name for f in init]
+            self.keywords = [f.name for f in init if f.kw_only is True]
+            for f in init:
+                if f.default is not dataclasses.MISSING:
+                    self.defaults.append(constant(f.default))
+                elif f.default_factory is not dataclasses.MISSING:
+                    self.defaults.append(f.default_factory)
+                else:
+                    self.defaults.append(None)
+
+        self.fields = {name: i for i, name in enumerate(self.names)}
+        self.decoders: list[Decoder | None] = []
+
+    def compile(self) -> None:
+        hints = get_type_hints(self.cls)
+        self.decoders = [decoder_for(hints.get(name)) for name in self.names]
+
+    def build(self, values: list[Any], count: int) -> T:
+        if count < len(values):
+            for i, value in enumerate(values):
+                if value is MISSING:
+                    default = self.defaults[i]
+                    if default is None:
+                        name = f"{self.cls.__name__}.{self.names[i]}"
+                        raise ValueError(f"Missing field {name}")
+                    values[i] = default()
+
+        if not self.slotted:
+            if not self.keywords:
+                return self.cls(*values)
+            n = len(values) - len(self.keywords)
+            return self.cls(*values[:n], **dict(zip(self.keywords, values[n:])))
+
+        instance = self.cls.__new__(self.cls)
+        for name, value in zip(self.names, values):
+            setattr(instance, name, value)
+        return instance
+
+    def loads(self, json: str) -> T | list[T]:
+        return SchemaParser().parse_schema(json, self)
+
+
+class SchemaParser(Parser):
+    def skip_comma(self) -> None:
+        if self.i < self.length and self.tokens[self.i].type == TokenType.COMMA:
+            self.i += 1
+
+    def skip_value(self) -> None:
+        tokens = self.tokens
+        depth = 0
+        while True:
+            match tokens[self.i].type:
+                case TokenType.L_CURLY | TokenType.L_BRACKET:
+                    depth += 1
+                case TokenType.R_CURLY | TokenType.R_BRACKET:
+                    depth -= 1
+            self.i += 1
+            if depth <= 0:
+                break
+        self.skip_comma()
+
+    def parse_record(self, schema: Schema[T]) -> T:
+        tokens = self.tokens
+        if tokens[self.i].type != TokenType.L_CURLY:
+            name = schema.cls.__name__
+            raise ValueError(self._error(f"Expected object for {name}"))
+        self.i += 1
+
+        fields = schema.fields
+        decoders = schema.decoders
+        values: list[Any] = [MISSING] * len(fields)
+        count = 0
+        while True:
+            t = tokens[self.i]
+            match t.type:
+                case TokenType.R_CURLY:
+                    self.i += 1
+                    break
+                case TokenType.STRING:
+                    key = self.key(t)
+                    self.i += 1
+                    if tokens[self.i].type != TokenType.COLON:
+                        raise ValueError(self._error("Expected colon"))
+                    self.i += 1
+
+                    index = fields.get(key)
+                    if index is None:
+                        self.skip_value()
+                        continue
+                    if values[index] is not MISSING:
+                        raise ValueError(self._error("Duplicate key found"))
+
+                    decoder = decoders[index]
+                    values[index] = (
+                        self.parse_value() if decoder is None else decoder(self)
+                    )
+                    count += 1
+                case _:
+                    raise ValueError(self._error("Invalid object content"))
+
+        self.skip_comma()
+        return schema.build(values, count)
+
+    def parse_list(self, item: Decoder) -> list[Any]:
+        tokens = self.tokens
+        if tokens[self.i].type != TokenType.L_BRACKET:
+            raise ValueError(self._error("Expected array"))
+        self.i += 1
+
+        result: list[Any] = []
+        while tokens[self.i].type != TokenType.R_BRACKET:
+            result.append(item(self))
+        self.i += 1
+        self.skip_comma()
+        return result
+
+    def parse_optional(self, inner: Decoder) -> Any:
+        if self.tokens[self.i].type == TokenType.NULL:
+            self.i += 1
+            self.skip_comma()
+            return None
+        return inner(self)
+
+    def parse_schema(self, json: str, schema: Schema[T]) -> T | list[T]:
+        try:
+            self.reset(json)
+            if self.length and self.tokens[0].type == TokenType.L_BRACKET:
+                result: T | list[T] = self.parse_list(
+                    partial(SchemaParser.parse_record, schema=schema)
+                )
+            else:
+                result = self.parse_record(schema)
+        except IndexError:
+            raise ValueError("Unexpected end of input") from None
+
+        if self.i != self.length:
+            raise ValueError(self._error("Extra data"))
+        return result
+
+
+def compile_schema(cls: type[T]) -> Schema[T]:
+    if not is_record(cls):
+        name = cls.__name__
+        raise TypeError(f"{name} is neither a dataclass nor a __slots__ class")
+
+    schema = SCHEMAS.get(cls)
+    if schema is None:
+        cached = set(SCHEMAS)
+        schema = SCHEMAS[cls] = Schema(cls)
+        try:
+            schema.compile()
+        except BaseException:
+            for key in set(SCHEMAS) - cached:
+                del SCHEMAS[key]
+            raise
+    return schema
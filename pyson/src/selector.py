@@ -0,0 +1,185 @@
+import re
+from dataclasses import dataclass, field
+
+from .pyson3 import ParseFloat, Value, unescape
+from .stream import Op, StreamParser, lex
+
+STEP = re.compile(
+    r"""
+    (?P<wildcard>\.\*|\[\*\])
+  | \.(?P<name>[^.\[\]]+)
+  | \[(?P<index>\d+)\]
+  | \[(?P<quoted>'[^']*'|"[^"]*")\]
+    """,
+    re.VERBOSE,
+)
+
+Selection = dict[str, list[Value]]
+SCALARS = {Op.STRING, Op.NUMBER, Op.BOOLEAN, Op.NULL}
+
+
+@dataclass
+class Node:
+    keys: dict[str, "Node"] = field(default_factory=dict)
+    indexes: dict[int, "Node"] = field(default_factory=dict)
+    wildcard: "Node | None" = None
+    paths: list[str] = field(default_factory=list)
+
+    def child(self, step: str | int | None) -> "Node":
+        match step:
+            case None:
+                self.wildcard = self.wildcard or Node()
+                return self.wildcard
+            case int():
+                return self.indexes.setdefault(step, Node())
+            case _:
+                return self.keys.setdefault(step, Node())
+
+    def match_key(self, key: str) -> list["Node"]:
+        nodes = [self.wildcard] if self.wildcard else []
+        if key in self.keys:
+            nodes.append(self.keys[key])
+        return nodes
+
+    def match_index(self, index: int) -> list["Node"]:
+        nodes = [self.wildcard] if self.wildcard else []
+        if index in self.indexes:
+            nodes.append(self.indexes[index])
+        return nodes
+
+
+def parse_path(path: str) -> list[str | int | None]:
+    if not path.startswith("$"):
+        raise ValueError(f"Path must start with '$': {path}")
+
+    steps: list[str | int | None] = []
+    i = 1
+    while i < len(path):
+        m = STEP.match(path, i)
+        if m is None:
+            raise ValueError(f"Unsupported path syntax at {i}: {path}")
+        match m.lastgroup:
+            case "name":
+                steps.append(m.group("name"))
+            case "index":
+                steps.append(int(m.group("index")))
+            case "quoted":
+                steps.append(m.group("quoted")[1:-1])
+            case _:
+                steps.append(None)
+        i = m.end()
+    return steps
+
+
+def collect(value: Value, nodes: list[Node], selection: Selection) -> None:
+    for node in nodes:
+        for path in node.paths:
+            selection[path].append(value)
+
+        if isinstance(value, dict):
+            for key, item in value.items():
+                collect(item, node.match_key(key), selection)
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                collect(item, node.match_index(index), selection)
+
+
+class Selector:
+    def __init__(self, paths: list[str], parse_float: ParseFloat = float) -> None:
+        self.paths = list(dict.fromkeys(paths))
+        self.parse_float = parse_float
+        self.root = Node()
+        for path in self.paths:
+            node = self.root
+            for step in parse_path(path):
+                node = node.child(step)
+            node.paths.append(path)
+
+    def children(self, nodes: list[Node], step: str | int) -> list[Node]:
+        if len(nodes) == 1 and nodes[0].wildcard is None:
+            node = nodes[0]
+            if isinstance(step, str):
+                child = node.keys.get(step)
+            else:
+                child = node.indexes.get(step)
+            return [child] if child else []
+        if isinstance(step, str):
+            return [n for node in nodes for n in node.match_key(step)]
+        return [n for node in nodes for n in node.match_index(step)]
+
+    def walk(self, nodes: list[Node]) -> None:
+        parser = self.parser
+        if any(node.paths for node in nodes):
+            collect(parser.parse_value(), nodes, self.selection)
+            return
+
+        json = self.parser.json
+        types = parser.types
+        starts = parser.starts
+        ends = parser.ends
+        flags = parser.flags
+        match types[parser.i]:
+            case Op.L_CURLY:
+                parser.i += 1
+                while types[parser.i] != Op.R_CURLY:
+                    i = parser.i
+                    if types[i] != Op.STRING:
+                        raise ValueError(parser._error("Invalid object content"))
+                    key = json[starts[i] + 1 : ends[i] - 1]
+                    if flags[i]:
+                        key = unescape(key)
+                    if types[i + 1] != Op.COLON:
+                        raise ValueError(parser._error("Expected colon"))
+                    parser.i = i + 2
+                    self.step(self.children(nodes, key))
+                parser.i += 1
+            case Op.L_BRACKET:
+                parser.i += 1
+                index = 0
+                while types[parser.i] != Op.R_BRACKET:
+                    self.step(self.children(nodes, index))
+                    index += 1
+                parser.i += 1
+            case _:
+                parser.i += 1
+
+        if parser.i < parser.length and types[parser.i] == Op.COMMA:
+            parser.i += 1
+
+    def step(self, nodes: list[Node]) -> None:
+        if nodes:
+            self.walk(nodes)
+            return
+
+        parser = self.parser
+        i = parser.i
+        if parser.types[i] in SCALARS:
+            i += 1
+            if parser.types[i] == Op.COMMA:
+                i += 1
+            parser.i = i
+        else:
+            parser.skip_value()
+
+    def select(self, json: str) -> Selection:
+        self.parser = StreamParser(parse_float=self.parse_float)
+        self.parser.reset(json, lex(json))
+        self.selection: Selection = {path: [] for path in self.paths}
+
+        if self.parser.length < 2:
+            raise ValueError(self.parser._error("Too short to be valid"))
+        if self.parser.types[0] not in (Op.L_CURLY, Op.L_BRACKET):
+            raise ValueError(self.parser._error("Invalid input"))
+
+        if self.root.paths:
+            value = self.parser.parse_tokens(json, self.parser.tokens)
+            collect(value, [self.root], self.selection)
+        else:
+            self.walk([self.root])
+        return self.selection
+
+
+def select(
+    json: str, paths: list[str], parse_float: ParseFloat = float
+) -> Selection:
+    return Selector(paths, parse_float).select(json)
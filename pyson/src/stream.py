@@ -0,0 +1,309 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import Any
+
+from .numeric import check_mode, pack
+from .pyson3 import (
+    JSON,
+    KEY_CACHE_SIZE,
+    SMALL_INTS,
+    Array,
+    Object,
+    ParseFloat,
+    Token,
+    TokenType,
+    Value,
+    decode_number,
+    unescape,
+)
+from .relex import TOKEN, unknown
+
+
+class Op:
+    L_CURLY = TokenType.L_CURLY.value
+    R_CURLY = TokenType.R_CURLY.value
+    L_BRACKET = TokenType.L_BRACKET.value
+    R_BRACKET = TokenType.R_BRACKET.value
+    COLON = TokenType.COLON.value
+    COMMA = TokenType.COMMA.value
+    STRING = TokenType.STRING.value
+    NUMBER = TokenType.NUMBER.value
+    BOOLEAN = TokenType.BOOLEAN.value
+    NULL = TokenType.NULL.value
+
+
+OPCODES: dict[str | None, int] = {t.name: t.value for t in TokenType}
+OPCODES["ESCAPED"] = Op.STRING
+OPCODES["FLOAT"] = Op.NUMBER
+
+
+@dataclass
+class TokenStream:
+    types: bytearray = field(default_factory=bytearray)
+    starts: array = field(default_factory=lambda: array("q"))
+    ends: array = field(default_factory=lambda: array("q"))
+    flags: bytearray = field(default_factory=bytearray)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, i: int) -> Token:
+        t = TokenType(self.types[i])
+        flag = bool(self.flags[i])
+        if t == TokenType.NUMBER:
+            return Token(t, self.starts[i], self.ends[i], False, flag)
+        return Token(t, self.starts[i], self.ends[i], flag)
+
+    def append(self, op: int, start: int, end: int, flag: int = 0) -> None:
+        self.types.append(op)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.flags.append(flag)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            len(self.types)
+            + len(self.flags)
+            + self.starts.itemsize * len(self.starts)
+            + self.ends.itemsize * len(self.ends)
+        )
+
+    @classmethod
+    def from_tokens(cls, tokens: list[Token]) -> "TokenStream":
+        stream = cls()
+        for t in tokens:
+            stream.append(t.type.value, t.start, t.end, t.escaped or t.is_float)
+        return stream
+
+
+def lex(json: str) -> TokenStream:
+    stream = TokenStream()
+    add_type = stream.types.append
+    add_start = stream.starts.append
+    add_end = stream.ends.append
+    add_flag = stream.flags.append
+    match_token = TOKEN.match
+    opcodes = OPCODES
+    total_len = len(json)
+
+    i = 0
+    while i < total_len:
+        m = match_token(json, i)
+        assert m  # mypy fix
+        kind = m.lastgroup
+        if kind is None:
+            end = m.end()
+            i = end if end > i else unknown(json, i)
+            continue
+
+        start, i = m.span(kind)
+        add_type(opcodes[kind])
+        add_start(start)
+        add_end(i)
+        add_flag(kind == "ESCAPED" or kind == "FLOAT")
+
+    return stream
+
+
+class StreamParser:
+    def _error(self, msg: str) -> str:
+        prior_tokens = [self.tokens[i] for i in range(max(self.i - 2, 0), self.i)]
+        value = self.tokens[self.i] if self.i < self.length else None
+        return f"{msg}, {prior_tokens=}, {self.i=}, {value=}"
+
+    def __init__(
+        self,
+        key_cache_size: int = KEY_CACHE_SIZE,
+        parse_float: ParseFloat = float,
+        numeric_arrays: str | None = None,
+        value_cache_size: int = 0,
+    ) -> None:
+        check_mode(numeric_arrays)
+        self.key_cache_size = key_cache_size
+        self.parse_float = parse_float
+        self.numeric_arrays = numeric_arrays
+        self.value_cache_size = value_cache_size
+        self.keys: dict[str, str] = {}
+        self.values: dict[str, Value] = {}
+
+    def key(self, i: int) -> str:
+        raw = self.json[self.starts[i] + 1 : self.ends[i] - 1]
+        key = self.keys.get(raw)
+        if key is None:
+            key = unescape(raw) if self.flags[i] else raw
+            if len(self.keys) < self.key_cache_size:
+                self.keys[raw] = key
+        return key
+
+    def shared_value(self, i: int) -> Value:
+        raw = self.json[self.starts[i] : self.ends[i]]
+        value = self.values.get(raw)
+        if value is None:
+            if self.types[i] == Op.STRING:
+                value = unescape(raw[1:-1]) if self.flags[i] else raw[1:-1]
+            else:
+                value = decode_number(raw, bool(self.flags[i]), self.parse_float)
+            if len(self.values) < self.value_cache_size:
+                self.values[raw] = value
+        return value
+
+    def normalized_string(self, i: int) -> str:
+        string = self.json[self.starts[i] + 1 : self.ends[i] - 1]
+        return unescape(string) if self.flags[i] else string
+
+    def parse_value(self) -> Value:
+        value: Value = None
+        i = self.i
+        self.i = i + 1
+        match self.types[i]:
+            case Op.STRING | Op.NUMBER if self.value_cache_size:
+                value = self.shared_value(i)
+            case Op.STRING:
+                value = self.normalized_string(i)
+            case Op.NUMBER:
+                string = self.json[self.starts[i] : self.ends[i]]
+                if self.flags[i]:
+                    value = self.parse_float(string)
+                else:
+                    value = SMALL_INTS.get(string)
+                    if value is None:
+                        value = int(string)
+            case Op.L_CURLY:
+                value = self.parse_object()
+            case Op.L_BRACKET:
+                value = self.parse_array()
+            case Op.BOOLEAN:
+                value = self.json[self.starts[i]] == "t"
+            case Op.NULL:
+                pass
+            case _:
+                self.i = i
+                raise ValueError(self._error("Unknown tokentype"))
+
+        if self.types[self.i] == Op.COMMA:
+            self.i += 1
+
+        return value
+
+    def skip_value(self) -> None:
+        types = self.types
+        i = self.i
+        depth = 0
+        while True:
+            match types[i]:
+                case Op.L_CURLY | Op.L_BRACKET:
+                    depth += 1
+                case Op.R_CURLY | Op.R_BRACKET:
+                    depth -= 1
+            i += 1
+            if depth <= 0:
+                break
+
+        if i < self.length and types[i] == Op.COMMA:
+            i += 1
+        self.i = i
+
+    def parse_object(self) -> Object:
+        result: Object = {}
+        types = self.types
+
+        while self.i < self.length:
+            match types[self.i]:
+                case Op.R_CURLY:
+                    self.i += 1
+                    break
+                case Op.STRING:
+                    key = self.key(self.i)
+                    if key in result:
+                        raise ValueError(self._error("Duplicate key found"))
+                    self.i += 1
+
+                    if types[self.i] != Op.COLON:
+                        raise ValueError(self._error("Expected colon"))
+                    self.i += 1
+
+                    result[key] = self.parse_value()
+                case _:
+                    raise ValueError(self._error("Invalid object content"))
+
+        return result
+
+    def parse_numeric_array(self) -> Any:
+        assert self.numeric_arrays  # mypy fix
+        types = self.types
+        j = self.i
+        while j + 1 < self.length and types[j] == Op.NUMBER:
+            match types[j + 1]:
+                case Op.R_BRACKET:
+                    text = self.json[self.starts[self.i] : self.ends[j]]
+                    packed = pack(text, self.numeric_arrays)
+                    if packed is not None:
+                        self.i = j + 2
+                    return packed
+                case Op.COMMA:
+                    j += 2
+                case _:
+                    return None
+        return None
+
+    def parse_array(self) -> Array:
+        if self.numeric_arrays is not None:
+            packed = self.parse_numeric_array()
+            if packed is not None:
+                return packed
+
+        result: Array = []
+        types = self.types
+
+        while self.i < self.length:
+            if types[self.i] == Op.R_BRACKET:
+                self.i += 1
+                break
+            result.append(self.parse_value())
+        return result
+
+    def reset(self, json: str, tokens: TokenStream) -> None:
+        self.json = json
+        self.tokens = tokens
+        self.types = tokens.types
+        self.starts = tokens.starts
+        self.ends = tokens.ends
+        self.flags = tokens.flags
+        self.length = len(tokens)
+        self.keys = {}
+        self.values = {}
+        self.i = 0
+
+    def parse_tokens(self, json: str, tokens: TokenStream) -> JSON:
+        self.reset(json, tokens)
+
+        if self.length < 2:
+            raise ValueError(self._error("Too short to be valid"))
+
+        self.i = 1
+        match self.types[0]:
+            case Op.L_CURLY:
+                return self.parse_object()
+            case Op.L_BRACKET:
+                return self.parse_array()
+            case _:
+                self.i = 0
+                raise ValueError(self._error("Invalid input"))
+
+    def parse(self, json: str) -> JSON:
+        return self.parse_tokens(json, lex(json))
+
+
+def loads(
+    json: str,
+    parse_float: ParseFloat = float,
+    numeric_arrays: str | None = None,
+    value_cache_size: int = 0,
+) -> JSON:
+    parser = StreamParser(
+        parse_float=parse_float,
+        numeric_arrays=numeric_arrays,
+        value_cache_size=value_cache_size,
+    )
+    return parser.parse(json)
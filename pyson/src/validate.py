@@ -0,0 +1,264 @@
+import argparse
+import codecs
+import re
+import sys
+from dataclasses import dataclass
+from typing import Literal
+
+Input = str | bytes | bytearray
+
+WS = r"[ \t\r\n]*"
+STRING = r"""
+    "[^"\\\x00-\x1f]*
+    (?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*
+    "
+"""
+SCALAR = r"""
+    -?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+\-]?[0-9]+)?
+  | true
+  | false
+  | null
+"""
+VALUE_PATTERN = rf"(?:{STRING}|{SCALAR})"
+
+TOKEN = rf"""
+    {WS}
+    (?:
+        (?P<OPEN>[\[{{])
+      | (?P<CLOSE>[\]}}](?:{WS}(?P<comma>,))?)
+      | (?P<COLON>:)
+      | (?P<COMMA>,)
+      | (?P<STRING>{STRING})
+      | (?P<SCALAR>{SCALAR})
+    )?
+"""
+ARRAY_RUN = rf"""
+    (?:{WS}{VALUE_PATTERN}{WS},)*
+    (?:
+        (?P<open>{WS}[\[{{])
+      | (?P<last>{WS}{VALUE_PATTERN}{WS}\](?:{WS}(?P<comma>,))?)
+    )?
+"""
+OBJECT_RUN = rf"""
+    (?:{WS}{STRING}{WS}:{WS}{VALUE_PATTERN}{WS},)*
+    (?:
+        (?P<open>{WS}{STRING}{WS}:{WS}[\[{{])
+      | (?P<last>
+            {WS}{STRING}{WS}:{WS}{VALUE_PATTERN}{WS}\}}(?:{WS}(?P<comma>,))?
+        )
+      | (?P<key>{WS}{STRING}{WS}:)
+    )?
+"""
+
+
+@dataclass(frozen=True)
+class Patterns:
+    token: re.Pattern
+    array_run: re.Pattern
+    object_run: re.Pattern
+    whitespace: re.Pattern
+
+
+def compile_patterns(text: bool) -> Patterns:
+    sources = (TOKEN, ARRAY_RUN, OBJECT_RUN, WS)
+    compiled = (re.compile(p if text else p.encode(), re.VERBOSE) for p in sources)
+    return Patterns(*compiled)
+
+
+PATTERNS = {str: compile_patterns(True), bytes: compile_patterns(False)}
+CURLY = ("{", "}", b"{", b"}")
+CHUNK_SIZE = 64 * 1024
+
+VALUE = 0
+FIRST_VALUE = 1
+KEY = 2
+FIRST_KEY = 3
+COLON = 4
+AFTER = 5
+
+EXPECTED = {
+    VALUE: "Expected value",
+    FIRST_VALUE: "Expected value or closing bracket",
+    KEY: "Expected string key",
+    FIRST_KEY: "Expected string key or closing curly",
+    COLON: "Expected colon",
+}
+
+
+@dataclass(frozen=True)
+class Invalid:
+    message: str
+    position: int
+
+    def __bool__(self) -> Literal[False]:
+        return False
+
+    def __str__(self) -> str:
+        return f"{self.message} at position {self.position}"
+
+
+def skip(pattern: re.Pattern, json: Input, i: int) -> int:
+    m = pattern.match(json, i)
+    assert m  # mypy fix
+    return m.end()
+
+
+def unmatched(json: Input, i: int) -> Invalid:
+    if i >= len(json):
+        return Invalid("Unexpected end of input", i)
+    c = json[i]
+    match chr(c) if isinstance(c, int) else c:
+        case '"':
+            return Invalid("Invalid string", i)
+        case "-" | "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9":
+            return Invalid("Invalid number", i)
+        case _:
+            return Invalid("Unexpected character", i)
+
+
+def check_utf8(json: bytes | bytearray) -> Invalid | None:
+    view = memoryview(json)
+    length = len(json)
+    i = 0
+    while i < length:
+        final = i + CHUNK_SIZE >= length
+        try:
+            _, consumed = codecs.utf_8_decode(view[i : i + CHUNK_SIZE], None, final)
+        except UnicodeDecodeError as e:
+            return Invalid("Invalid UTF-8", i + e.start)
+        i += consumed
+    return None
+
+
+def validate(json: Input) -> Literal[True] | Invalid:
+    if isinstance(json, str):
+        patterns = PATTERNS[str]
+    else:
+        error = check_utf8(json)
+        if error is not None:
+            return error
+        patterns = PATTERNS[bytes]
+
+    match_token = patterns.token.match
+    match_array = patterns.array_run.match
+    match_object = patterns.object_run.match
+    length = len(json)
+    stack: list[bool] = []
+    in_object = False
+    state = VALUE
+
+    i = 0
+    while True:
+        m = match_token(json, i)
+        assert m  # mypy fix
+        kind = m.lastgroup
+        if kind is None:
+            return unmatched(json, m.end())
+        start, i = m.span(kind)
+
+        if kind == "CLOSE":
+            if (json[start : start + 1] in CURLY) != in_object or not stack:
+                return Invalid("Mismatched closing token", start)
+            if state != AFTER and state != (FIRST_KEY if in_object else FIRST_VALUE):
+                return Invalid(EXPECTED[state], start)
+            stack.pop()
+            comma = m.start("comma")
+            if not stack:
+                if comma != -1:
+                    return Invalid("Unexpected comma", comma)
+                break
+            in_object = stack[-1]
+            state = AFTER
+            if comma == -1:
+                continue
+            empty = KEY if in_object else VALUE
+        elif kind == "COMMA":
+            if state != AFTER or not stack:
+                return Invalid("Unexpected comma", start)
+            empty = KEY if in_object else VALUE
+        elif kind == "COLON":
+            if state != COLON:
+                return Invalid("Unexpected colon", start)
+            state = VALUE
+            continue
+        elif state == KEY or state == FIRST_KEY:
+            if kind != "STRING":
+                return Invalid(EXPECTED[state], start)
+            state = COLON
+            continue
+        elif state == VALUE or state == FIRST_VALUE:
+            if kind == "OPEN":
+                in_object = json[start : start + 1] in CURLY
+                stack.append(in_object)
+                empty = FIRST_KEY if in_object else FIRST_VALUE
+            elif not stack:
+                return Invalid("Invalid input", start)
+            else:
+                state = AFTER
+                continue
+        elif state == AFTER:
+            expected = "curly" if in_object else "bracket"
+            return Invalid(f"Expected comma or closing {expected}", start)
+        else:
+            return Invalid(EXPECTED[state], start)
+
+        while True:
+            m = match_object(json, i) if in_object else match_array(json, i)
+            assert m  # mypy fix
+            end = m.end()
+            tail = m.lastgroup
+            if tail == "open":
+                in_object = json[end - 1 : end] in CURLY
+                stack.append(in_object)
+                empty = FIRST_KEY if in_object else FIRST_VALUE
+            elif tail == "last":
+                stack.pop()
+                comma = m.start("comma")
+                if not stack:
+                    if comma != -1:
+                        return Invalid("Unexpected comma", comma)
+                    i = end
+                    break
+                in_object = stack[-1]
+                state = AFTER
+                if comma == -1:
+                    i = end
+                    break
+                empty = KEY if in_object else VALUE
+            else:
+                if tail == "key":
+                    state = VALUE
+                elif end > i:
+                    state = KEY if in_object else VALUE
+                else:
+                    state = empty
+                i = end
+                break
+            i = end
+
+        if not stack:
+            break
+
+    i = skip(patterns.whitespace, json, i)
+    if i != length:
+        return Invalid("Extra data", i)
+    return True
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("file")
+
+
+def main(args: argparse.Namespace) -> int:
+    if args.file == "-":
+        json = sys.stdin.buffer.read()
+    else:
+        with open(args.file, "rb") as f:
+            json = f.read()
+
+    result = validate(json)
+    if not result:
+        print(f"{args.file}: {result}", file=sys.stderr)
+        return 1
+    print(f"{args.file}: valid", file=sys.stderr)
+    return 0
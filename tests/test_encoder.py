@@ -0,0 +1,11 @@
+from enum import Enum
+
+from pyson.src import encoder
+
+
+class Color(str, Enum):
+    RED = "red"
+
+
+def test_str_enum_encodes_as_value() -> None:
+    assert encoder.dumps([Color.RED, {Color.RED: 1}]) == '["red",{"red":1}]'
@@ -0,0 +1,9 @@
+import pytest
+
+from pyson.src import ENGINES, loads
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+@pytest.mark.parametrize("json", ['{"a": [1, "b"]}', b'{"a": [1, "b"]}'])
+def test_engines_accept_str_and_bytes(engine: str, json: str | bytes) -> None:
+    assert loads(json, engine=engine) == {"a": [1, "b"]}
@@ -0,0 +1,39 @@
+import pytest
+
+from pyson.src import parallel, pyson3
+
+MALFORMED = ["[1,2}", "[1,,2]", "[1,2,]", "[,1,2]", "[1, ,2]", "[1,2 , ]", "[1,[2],,3]"]
+ENGINES = ["tokens", "direct", "stream"]
+
+
+def sequential(json: str, engine: str) -> object:
+    try:
+        return pyson3.loads(json, engine=engine)
+    except (ValueError, IndexError) as e:
+        return type(e)
+
+
+def concurrent(json: str, engine: str) -> object:
+    try:
+        return parallel.loads(json, workers=2, engine=engine, min_size=0)
+    except (ValueError, IndexError) as e:
+        return type(e)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("json", MALFORMED)
+def test_malformed_arrays_match_sequential(json: str, engine: str) -> None:
+    assert concurrent(json, engine) == sequential(json, engine)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_well_formed_array_matches_sequential(engine: str) -> None:
+    items = [f'{{"id": {i}, "tags": ["a", "b"]}}' for i in range(50)]
+    json = "[" + ", ".join(items) + "]"
+    assert concurrent(json, engine) == sequential(json, engine)
+
+
+def test_blank_elements_fall_back_to_sequential() -> None:
+    assert parallel.top_level_commas("[1,,2]") is None
+    assert parallel.top_level_commas("[1,2,]") is None
+    assert parallel.top_level_commas("[1, 2]") == (0, 5, [2])
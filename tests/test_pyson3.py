@@ -0,0 +1,28 @@
+import pytest
+
+from pyson.src import pyson3
+
+
+def test_max_depth_is_forwarded_to_iterative() -> None:
+    json = "[" * 5 + "]" * 5
+    assert pyson3.loads(json, engine="iterative", max_depth=5) == [[[[[]]]]]
+    with pytest.raises(ValueError):
+        pyson3.loads(json, engine="iterative", max_depth=4)
+
+
+@pytest.mark.parametrize("engine", ["tokens", "direct", "regex", "stream"])
+def test_max_depth_is_rejected_for_other_engines(engine: str) -> None:
+    with pytest.raises(ValueError, match="max_depth"):
+        pyson3.loads("[]", engine=engine, max_depth=5)
+
+
+def test_select_uses_parse_float() -> None:
+    json = '{"a": [1.5, 2], "b": 3.25}'
+    selection = pyson3.loads(json, select=["$.a[*]", "$.b"], parse_float=str)
+    assert selection == {"$.a[*]": ["1.5", 2], "$.b": ["3.25"]}
+
+
+@pytest.mark.parametrize("select", [None, ["$.a"]])
+def test_unknown_engine_is_rejected(select: list[str] | None) -> None:
+    with pytest.raises(ValueError, match="Unknown engine"):
+        pyson3.loads('{"a": 1}', engine="nope", select=select)
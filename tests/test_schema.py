@@ -0,0 +1,49 @@
+from dataclasses import dataclass, field
+
+import pytest
+
+from pyson.src.schema import SCHEMAS, compile_schema
+
+
+@dataclass(kw_only=True)
+class KeywordOnly:
+    x: int
+    y: str = "y"
+
+
+@dataclass
+class Mixed:
+    a: int
+    b: int = field(kw_only=True)
+    c: list[KeywordOnly] = field(default_factory=list)
+
+
+@dataclass
+class Broken:
+    a: int
+    b: "Undefined"  # type: ignore[name-defined]  # noqa: F821
+
+
+@dataclass
+class Outer:
+    inner: Broken
+
+
+def test_kw_only_dataclass() -> None:
+    schema = compile_schema(KeywordOnly)
+    assert schema.loads('{"y": "b", "x": 1}') == KeywordOnly(x=1, y="b")
+    assert schema.loads('{"x": 2}') == KeywordOnly(x=2)
+
+
+def test_kw_only_field() -> None:
+    json = '{"b": 2, "c": [{"x": 3}], "a": 1}'
+    assert compile_schema(Mixed).loads(json) == Mixed(1, b=2, c=[KeywordOnly(x=3)])
+
+
+@pytest.mark.parametrize("cls", [Broken, Outer])
+def test_failed_compile_is_not_cached(cls: type) -> None:
+    for _ in range(2):
+        with pytest.raises(NameError):
+            compile_schema(cls)
+        assert Broken not in SCHEMAS
+        assert Outer not in SCHEMAS
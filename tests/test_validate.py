@@ -0,0 +1,80 @@
+import pytest
+
+from pyson.src.pyson3 import unescape
+from pyson.src.validate import Invalid, validate
+
+VALID = [
+    "[]",
+    "{}",
+    '[1.5e-3, -0, 0.25, 1E+2, "\\u00e9", true, false, null]',
+    ' {"a": [1, {"b": "c"}], "d": ""} ',
+    b'["\xc3\xa9"]',
+    bytearray(b'{"a": [1]}'),
+]
+
+INVALID = [
+    ("[1,]", "Expected value", 3),
+    ('{"a":1,}', "Expected string key", 7),
+    ("[1 2]", "Expected comma or closing bracket", 3),
+    ('{"a" 1}', "Expected colon", 5),
+    ("[1,,2]", "Unexpected comma", 3),
+    ("[,1]", "Unexpected comma", 1),
+    ("[01]", "Expected comma or closing bracket", 2),
+    ("[-01]", "Expected comma or closing bracket", 3),
+    ("[1.]", "Unexpected character", 2),
+    ("[.5]", "Unexpected character", 1),
+    ("[1e]", "Unexpected character", 2),
+    ("[1e+]", "Unexpected character", 2),
+    ('["a\tb"]', "Invalid string", 1),
+    ('["\x01"]', "Invalid string", 1),
+    ("[1}", "Mismatched closing token", 2),
+    ('{"a":1]', "Mismatched closing token", 6),
+    ("[1]x", "Extra data", 3),
+    ("[1] [2]", "Extra data", 4),
+    ("[", "Unexpected end of input", 1),
+    ("", "Unexpected end of input", 0),
+    (b'["\xff"]', "Invalid UTF-8", 2),
+    (b'["a\xc3"]', "Invalid UTF-8", 3),
+    (b'["\xed\xa0\x80"]', "Invalid UTF-8", 2),
+    (b'["' + b"a" * 65534 + b'\xe2\xff\xac"]', "Invalid UTF-8", 65536),
+]
+
+UNESCAPED = [
+    ("\\n\\t\\/\\\"\\\\", "\n\t/\"\\"),
+    ("\\u00e9", "é"),
+    ("\\ud83d\\ude00", "\U0001f600"),
+    ("a\\ud83d\\ude00b", "a\U0001f600b"),
+    ("\\ud83d", "\ud83d"),
+    ("\\ude00", "\ude00"),
+    ("\\ud83dx", "\ud83dx"),
+    ("\\ud83d\\ud83d", "\ud83d\ud83d"),
+    ("\\ude00\\ud83d", "\ude00\ud83d"),
+]
+
+MALFORMED_ESCAPES = [
+    ("\\u12", "Invalid unicode sequence"),
+    ("\\u12g4", "Invalid unicode sequence"),
+    ("\\x", "Invalid string escaping"),
+    ("\\", "Invalid string escaping"),
+]
+
+
+@pytest.mark.parametrize("json", VALID)
+def test_valid(json: str | bytes) -> None:
+    assert validate(json) is True
+
+
+@pytest.mark.parametrize("json, message, position", INVALID)
+def test_invalid(json: str | bytes, message: str, position: int) -> None:
+    assert validate(json) == Invalid(message, position)
+
+
+@pytest.mark.parametrize("escaped, expected", UNESCAPED)
+def test_unescape(escaped: str, expected: str) -> None:
+    assert unescape(escaped) == expected
+
+
+@pytest.mark.parametrize("escaped, message", MALFORMED_ESCAPES)
+def test_malformed_escape(escaped: str, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        unescape(escaped)